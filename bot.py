@@ -25,6 +25,7 @@ from src.handlers import (
     recalc_ranks_command,
 )
 from services.singleton import sheets_service
+from services.postgres_service import close_connection_pools
 
 
 # Setup logging to file and console
@@ -157,7 +158,11 @@ def main() -> None:
     logger.info(f"Payout rate: {Config.PAYOUT_RATE * 100}%")
 
     # Run bot
-    application.run_polling()
+    try:
+        application.run_polling()
+    finally:
+        # Close pooled PostgreSQL connections on shutdown
+        close_connection_pools()
 
 
 if __name__ == "__main__":
@@ -24,6 +24,14 @@ class Config:
     POSTGRES_DB: str = os.getenv("DB_NAME", "alex12060")
     POSTGRES_USER: str = os.getenv("DB_USER", "lexun")
     POSTGRES_PASSWORD: str = os.getenv("DB_PASSWORD", "")
+    DB_POOL_MIN: int = int(os.getenv("DB_POOL_MIN", "1"))
+    DB_POOL_MAX: int = int(os.getenv("DB_POOL_MAX", "10"))
+    DB_POOL_IDLE_TIMEOUT: float = float(os.getenv("DB_POOL_IDLE_TIMEOUT", "60"))
+    # Seconds getconn() waits for a free connection when all DB_POOL_MAX are in use
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    # Session SET statements run once per new pooled connection,
+    # e.g. "SET TIME ZONE 'UTC'; SET search_path TO app, public"
+    DB_SESSION_SQL: str = os.getenv("DB_SESSION_SQL", "")
 
     # Products
     PRODUCTS: List[str] = [
@@ -98,10 +98,6 @@ def run_migration():
         # 5. Мигрировать существующих сотрудников
         print("\n4. Миграция сотрудников...")
 
-        # Получить всех сотрудников
-        cursor.execute("SELECT id, name FROM employees WHERE is_active = TRUE")
-        employees = cursor.fetchall()
-
         # Определить прошлый месяц
         now = datetime.now()
         if now.month == 1:
@@ -113,41 +109,46 @@ def run_migration():
 
         print(f"   Анализ продаж за {prev_month:02d}/{prev_year}")
 
-        for emp in employees:
-            # Получить total_sales за прошлый месяц
-            cursor.execute("""
-                SELECT COALESCE(SUM(total_sales), 0) as total
-                FROM shifts
-                WHERE employee_id = %s
-                  AND EXTRACT(YEAR FROM date) = %s
-                  AND EXTRACT(MONTH FROM date) = %s
-            """, (emp['id'], prev_year, prev_month))
-
-            result = cursor.fetchone()
-            total_sales = float(result['total']) if result else 0
-
-            # Определить тир
-            cursor.execute("""
-                SELECT id, name, percentage FROM base_commissions
-                WHERE %s >= min_amount AND %s <= max_amount AND is_active = TRUE
-                ORDER BY min_amount DESC LIMIT 1
-            """, (total_sales, total_sales))
-
-            tier = cursor.fetchone()
-            tier_id = tier['id'] if tier else tier_c_id
-            tier_name = tier['name'] if tier else 'Tier C'
-            tier_pct = tier['percentage'] if tier else 6.0
-
-            # Обновить сотрудника
-            cursor.execute("""
-                UPDATE employees
-                SET base_commission_id = %s,
-                    last_tier_update = CURRENT_DATE,
-                    updated_at = now()
-                WHERE id = %s
-            """, (tier_id, emp['id']))
-
-            print(f"   • {emp['name']}: ${total_sales:,.0f} → {tier_name} ({tier_pct}%)")
+        # Продажи за месяц, выбор тира и обновление — одним запросом на сервере,
+        # без цикла по сотрудникам; RETURNING отдаёт строки для вывода
+        cursor.execute("""
+            UPDATE employees e
+            SET base_commission_id = s.tier_id,
+                last_tier_update = CURRENT_DATE,
+                updated_at = now()
+            FROM (
+                SELECT m.id,
+                       m.total_sales,
+                       COALESCE(t.id, %(tier_c_id)s) as tier_id,
+                       COALESCE(t.name, 'Tier C') as tier_name,
+                       COALESCE(t.percentage, 6.0) as tier_pct
+                FROM (
+                    SELECT emp.id, COALESCE(SUM(sh.total_sales), 0) as total_sales
+                    FROM employees emp
+                    LEFT JOIN shifts sh ON sh.employee_id = emp.id
+                        AND sh.date >= %(month_start)s
+                        AND sh.date < %(month_end)s
+                    WHERE emp.is_active = TRUE
+                    GROUP BY emp.id
+                ) m
+                LEFT JOIN LATERAL (
+                    SELECT id, name, percentage FROM base_commissions
+                    WHERE m.total_sales >= min_amount AND m.total_sales <= max_amount AND is_active = TRUE
+                    ORDER BY min_amount DESC LIMIT 1
+                ) t ON TRUE
+            ) s
+            WHERE e.id = s.id
+            RETURNING e.name, s.total_sales, s.tier_name, s.tier_pct
+        """, {
+            'tier_c_id': tier_c_id,
+            'month_start': datetime(prev_year, prev_month, 1),
+            'month_end': datetime(now.year, now.month, 1),
+        })
+
+        print("\n".join(
+            f"   • {emp['name']}: ${emp['total_sales']:,.0f} → {emp['tier_name']} ({emp['tier_pct']}%)"
+            for emp in cursor.fetchall()
+        ))
 
         # 6. Создать функции
         print("\n5. Создание функций...")
@@ -196,10 +197,12 @@ def run_migration():
         # 7. Удалить dynamic_rates
         print("\n6. Удаление dynamic_rates...")
 
-        cursor.execute("DROP FUNCTION IF EXISTS get_dynamic_rate(DECIMAL)")
+        # Оба DROP одним запросом — один round-trip вместо двух
+        cursor.execute("""
+            DROP FUNCTION IF EXISTS get_dynamic_rate(DECIMAL);
+            DROP TABLE IF EXISTS dynamic_rates CASCADE;
+        """)
         print("   ✓ Функция get_dynamic_rate удалена")
-
-        cursor.execute("DROP TABLE IF EXISTS dynamic_rates CASCADE")
         print("   ✓ Таблица dynamic_rates удалена")
 
         # Commit
@@ -218,8 +221,10 @@ def run_migration():
             WHERE e.is_active = TRUE
             ORDER BY bc.display_order, e.name
         """)
-        for emp in cursor.fetchall():
-            print(f"   • {emp['name']}: {emp['tier']} ({emp['percentage']}%)")
+        print("\n".join(
+            f"   • {emp['name']}: {emp['tier']} ({emp['percentage']}%)"
+            for emp in cursor.fetchall()
+        ))
 
     except Exception as e:
         conn.rollback()
@@ -120,8 +120,10 @@ def run_migration():
             SELECT name, sales_commission FROM employees
             WHERE is_active = TRUE ORDER BY name
         """)
-        for emp in cursor.fetchall():
-            print(f"   • {emp['name']}: {emp['sales_commission']}%")
+        print("\n".join(
+            f"   • {emp['name']}: {emp['sales_commission']}%"
+            for emp in cursor.fetchall()
+        ))
 
     except Exception as e:
         conn.rollback()
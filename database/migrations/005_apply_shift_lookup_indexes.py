@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Migration: Индексы для выборок смен по сотруднику (shifts(employee_id, date))
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from dotenv import load_dotenv
+load_dotenv(project_root / '.env')
+
+
+def get_connection():
+    return psycopg2.connect(
+        host=os.getenv('DB_HOST', 'localhost'),
+        port=os.getenv('DB_PORT', '5432'),
+        database=os.getenv('DB_NAME', 'alex12060'),
+        user=os.getenv('DB_USER', 'alex12060_user'),
+        password=os.getenv('DB_PASSWORD', 'alex12060_pass'),
+        cursor_factory=RealDictCursor
+    )
+
+
+def run_migration():
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    try:
+        print("=" * 60)
+        print("Индексы для выборок смен по сотруднику")
+        print("=" * 60)
+
+        # 1. Составной индекс (employee_id, date)
+        print("\n1. Создание индекса idx_shifts_employee_date...")
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_shifts_employee_date
+            ON shifts (employee_id, date)
+        """)
+        print("   ✓ Индекс создан")
+
+        # 2. Статистика планировщика
+        print("\n2. ANALYZE shifts...")
+        cursor.execute("ANALYZE shifts")
+        print("   ✓ Статистика обновлена")
+
+        conn.commit()
+
+        print("\n" + "=" * 60)
+        print("✅ Миграция успешно завершена!")
+        print("=" * 60)
+
+        # Показать индексы shifts
+        print("\nИндексы таблицы shifts:")
+        cursor.execute("""
+            SELECT indexname, indexdef FROM pg_indexes
+            WHERE tablename = 'shifts' ORDER BY indexname
+        """)
+        for idx in cursor.fetchall():
+            print(f"   • {idx['indexname']}: {idx['indexdef']}")
+
+    except Exception as e:
+        conn.rollback()
+        print(f"\n❌ Ошибка: {e}")
+        raise
+
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == '__main__':
+    run_migration()
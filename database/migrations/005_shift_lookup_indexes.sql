@@ -0,0 +1,19 @@
+-- Migration: Индексы для выборок смен по сотруднику
+-- Date: 2026-10-16
+-- Description: Составной индекс shifts(employee_id, date) для запросов
+--              get_last_shifts / determine_rank / update_employee_tier
+
+-- ============================================================================
+-- 1. Смены сотрудника по дате
+-- ============================================================================
+
+-- WHERE employee_id = ... AND date ... / ORDER BY date DESC
+-- без индекса каждая такая выборка — последовательное сканирование shifts
+CREATE INDEX IF NOT EXISTS idx_shifts_employee_date
+ON shifts (employee_id, date);
+
+-- ============================================================================
+-- 2. Обновить статистику планировщика
+-- ============================================================================
+
+ANALYZE shifts;
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Migration: Покрывающий индекс shifts(employee_id, date, clock_in) INCLUDE (total_sales)
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from dotenv import load_dotenv
+load_dotenv(project_root / '.env')
+
+
+def get_connection():
+    return psycopg2.connect(
+        host=os.getenv('DB_HOST', 'localhost'),
+        port=os.getenv('DB_PORT', '5432'),
+        database=os.getenv('DB_NAME', 'alex12060'),
+        user=os.getenv('DB_USER', 'alex12060_user'),
+        password=os.getenv('DB_PASSWORD', 'alex12060_pass'),
+        cursor_factory=RealDictCursor
+    )
+
+
+def run_migration():
+    conn = get_connection()
+    # CREATE/DROP INDEX CONCURRENTLY не работают внутри транзакции
+    conn.autocommit = True
+    cursor = conn.cursor()
+
+    try:
+        print("=" * 60)
+        print("Покрывающий индекс смен сотрудника")
+        print("=" * 60)
+
+        # Каждая команда — отдельная транзакция: прерванный CREATE INDEX CONCURRENTLY
+        # оставляет INVALID индекс, который IF NOT EXISTS пропустил бы навсегда
+        cursor.execute("""
+            SELECT i.indisvalid FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = 'idx_shifts_emp_date_clockin'
+        """)
+        existing = cursor.fetchone()
+        if existing and not existing['indisvalid']:
+            print("\n0. Удаление недостроенного индекса idx_shifts_emp_date_clockin...")
+            cursor.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_shifts_emp_date_clockin")
+            print("   ✓ Индекс удалён")
+
+        # 1. Составной индекс (employee_id, date, clock_in) INCLUDE (total_sales)
+        print("\n1. Создание индекса idx_shifts_emp_date_clockin...")
+        cursor.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_shifts_emp_date_clockin
+            ON shifts (employee_id, date, clock_in) INCLUDE (total_sales)
+        """)
+        print("   ✓ Индекс создан")
+
+        # 2. Префикс (employee_id, date) покрыт новым индексом
+        print("\n2. Удаление idx_shifts_employee_date...")
+        cursor.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_shifts_employee_date")
+        print("   ✓ Индекс удалён")
+
+        # 3. Статистика планировщика
+        print("\n3. ANALYZE shifts...")
+        cursor.execute("ANALYZE shifts")
+        print("   ✓ Статистика обновлена")
+
+        print("\n" + "=" * 60)
+        print("✅ Миграция успешно завершена!")
+        print("=" * 60)
+
+        # План get_last_shifts: ожидается Index Scan Backward без узла Sort
+        print("\nEXPLAIN get_last_shifts:")
+        cursor.execute("""
+            EXPLAIN SELECT id FROM shifts
+            WHERE employee_id = (SELECT employee_id FROM shifts LIMIT 1)
+            ORDER BY date DESC, clock_in DESC
+            LIMIT 3
+        """)
+        for row in cursor.fetchall():
+            print(f"   {row['QUERY PLAN']}")
+
+    except Exception as e:
+        print(f"\n❌ Ошибка: {e}")
+        raise
+
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == '__main__':
+    run_migration()
@@ -0,0 +1,24 @@
+-- Migration: Покрывающий индекс смен сотрудника с clock_in
+-- Date: 2026-10-16
+-- Description: Составной индекс shifts(employee_id, date, clock_in) INCLUDE (total_sales)
+--              для get_last_shifts (ORDER BY date DESC, clock_in DESC) и
+--              месячных сумм продаж; заменяет idx_shifts_employee_date
+-- Note: CONCURRENTLY нельзя выполнять внутри транзакции (psql без -1)
+
+-- ============================================================================
+-- 1. Смены сотрудника по дате и времени начала
+-- ============================================================================
+
+-- Строки возвращаются в порядке индекса — без узла Sort;
+-- total_sales в INCLUDE позволяет считать суммы index-only сканом
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_shifts_emp_date_clockin
+ON shifts (employee_id, date, clock_in) INCLUDE (total_sales);
+
+-- Префикс (employee_id, date) теперь покрыт новым индексом
+DROP INDEX CONCURRENTLY IF EXISTS idx_shifts_employee_date;
+
+-- ============================================================================
+-- 2. Обновить статистику планировщика
+-- ============================================================================
+
+ANALYZE shifts;
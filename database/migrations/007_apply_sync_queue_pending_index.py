@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Migration: Частичный индекс sync_queue(created_at) WHERE status = 'pending'
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from dotenv import load_dotenv
+load_dotenv(project_root / '.env')
+
+
+def get_connection():
+    return psycopg2.connect(
+        host=os.getenv('DB_HOST', 'localhost'),
+        port=os.getenv('DB_PORT', '5432'),
+        database=os.getenv('DB_NAME', 'alex12060'),
+        user=os.getenv('DB_USER', 'alex12060_user'),
+        password=os.getenv('DB_PASSWORD', 'alex12060_pass'),
+        cursor_factory=RealDictCursor
+    )
+
+
+def run_migration():
+    conn = get_connection()
+    # CREATE INDEX CONCURRENTLY не работает внутри транзакции
+    conn.autocommit = True
+    cursor = conn.cursor()
+
+    try:
+        print("=" * 60)
+        print("Частичный индекс очереди синхронизации")
+        print("=" * 60)
+
+        # Прерванный CREATE INDEX CONCURRENTLY оставляет INVALID индекс,
+        # который IF NOT EXISTS пропустил бы навсегда
+        cursor.execute("""
+            SELECT i.indisvalid FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = 'idx_sync_queue_pending_created'
+        """)
+        existing = cursor.fetchone()
+        if existing and not existing['indisvalid']:
+            print("\n0. Удаление недостроенного индекса idx_sync_queue_pending_created...")
+            cursor.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_sync_queue_pending_created")
+            print("   ✓ Индекс удалён")
+
+        # 1. Частичный индекс по pending-записям
+        print("\n1. Создание индекса idx_sync_queue_pending_created...")
+        cursor.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_sync_queue_pending_created
+            ON sync_queue (created_at)
+            WHERE status = 'pending'
+        """)
+        print("   ✓ Индекс создан")
+
+        # 2. Статистика планировщика
+        print("\n2. ANALYZE sync_queue...")
+        cursor.execute("ANALYZE sync_queue")
+        print("   ✓ Статистика обновлена")
+
+        print("\n" + "=" * 60)
+        print("✅ Миграция успешно завершена!")
+        print("=" * 60)
+
+        # План выборки pg_sync_worker: ожидается Index Scan по idx_sync_queue_pending_created
+        print("\nEXPLAIN pending syncs:")
+        cursor.execute("""
+            EXPLAIN SELECT id FROM sync_queue
+            WHERE status = 'pending'
+            ORDER BY created_at ASC
+            LIMIT 100
+        """)
+        for row in cursor.fetchall():
+            print(f"   {row['QUERY PLAN']}")
+
+    except Exception as e:
+        print(f"\n❌ Ошибка: {e}")
+        raise
+
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == '__main__':
+    run_migration()
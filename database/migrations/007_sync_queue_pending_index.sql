@@ -0,0 +1,20 @@
+-- Migration: Частичный индекс очереди синхронизации по pending
+-- Date: 2026-10-16
+-- Description: sync_queue(created_at) WHERE status = 'pending' для выборки
+--              pg_sync_worker (WHERE status = 'pending' ORDER BY created_at LIMIT 100);
+--              обработанные записи в индекс не попадают, он остаётся маленьким
+-- Note: CONCURRENTLY нельзя выполнять внутри транзакции (psql без -1)
+
+-- ============================================================================
+-- 1. Ожидающие записи очереди в порядке создания
+-- ============================================================================
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_sync_queue_pending_created
+ON sync_queue (created_at)
+WHERE status = 'pending';
+
+-- ============================================================================
+-- 2. Обновить статистику планировщика
+-- ============================================================================
+
+ANALYZE sync_queue;
@@ -3,9 +3,7 @@
 This script fetches rank data from the "Ranks" sheet and populates
 the PostgreSQL ranks table with the correct data.
 """
-import psycopg2
-from psycopg2 import extras
-from config import Config
+from services.postgres_service import get_connection
 from sheets_service import SheetsService
 
 def main():
@@ -21,61 +19,90 @@ def main():
     print(f"✓ Found {len(sheets_ranks)} ranks in Google Sheets")
 
     # Connect to PostgreSQL
-    conn = psycopg2.connect(**Config.get_db_params(), cursor_factory=extras.RealDictCursor)
-    cursor = conn.cursor()
-
-    try:
-        # Clear existing employee_ranks first (due to foreign key)
-        cursor.execute('DELETE FROM employee_ranks')
-        print('✓ Cleared existing employee_ranks from PostgreSQL')
-
-        # Clear existing ranks
-        cursor.execute('DELETE FROM ranks')
-        print('✓ Cleared existing ranks from PostgreSQL')
-
-        # Insert ranks from Sheets
-        for idx, rank in enumerate(sheets_ranks, 1):
-            rank_name = rank.get("Rank Name", "")
-            min_amount = float(rank.get("Min Amount", 0))
-            max_amount = float(rank.get("Max Amount", 999999))
-            emoji = rank.get("Emoji", "")
-            text = rank.get("TEXT", "")
+    with get_connection() as conn:
+        cursor = conn.cursor()
 
+        try:
+            # Clear existing employee_ranks first (due to foreign key)
+            cursor.execute('DELETE FROM employee_ranks')
+            print('✓ Cleared existing employee_ranks from PostgreSQL')
+
+            # Clear existing ranks
+            cursor.execute('DELETE FROM ranks')
+            print('✓ Cleared existing ranks from PostgreSQL')
+
+            # Insert ranks from Sheets
+            for idx, rank in enumerate(sheets_ranks, 1):
+                rank_name = rank.get("Rank Name", "")
+                min_amount = float(rank.get("Min Amount", 0))
+                max_amount = float(rank.get("Max Amount", 999999))
+                emoji = rank.get("Emoji", "")
+                text = rank.get("TEXT", "")
+
+                cursor.execute("""
+                    INSERT INTO ranks (
+                        name, min_amount, max_amount, emoji, text,
+                        display_order, is_active
+                    )
+                    VALUES (%s, %s, %s, %s, %s, %s, true)
+                """, (
+                    rank_name,
+                    min_amount,
+                    max_amount,
+                    emoji,
+                    text,
+                    idx
+                ))
+
+                print(f"✓ Imported: {rank_name} ({emoji}) ${min_amount:.0f} - ${max_amount:.0f}")
+
+            # Rebuild employee_ranks for every employee and month in one set-based
+            # upsert: sales are aggregated server-side and matched to the new ranks
             cursor.execute("""
-                INSERT INTO ranks (
-                    name, min_amount, max_amount, emoji, text,
-                    display_order, is_active
-                )
-                VALUES (%s, %s, %s, %s, %s, %s, true)
-            """, (
-                rank_name,
-                min_amount,
-                max_amount,
-                emoji,
-                text,
-                idx
-            ))
-
-            print(f"✓ Imported: {rank_name} ({emoji}) ${min_amount:.0f} - ${max_amount:.0f}")
-
-        conn.commit()
-        print(f"\n✅ Successfully imported {len(sheets_ranks)} ranks from Google Sheets to PostgreSQL")
-
-        # Verify
-        cursor.execute('SELECT name, min_amount, max_amount, emoji FROM ranks ORDER BY display_order')
-        db_ranks = cursor.fetchall()
-
-        print("\n📊 Ranks in PostgreSQL database:")
-        for rank in db_ranks:
-            print(f"  {rank['emoji']} {rank['name']}: ${rank['min_amount']:.0f} - ${rank['max_amount']:.0f}")
-
-    except Exception as e:
-        conn.rollback()
-        print(f'❌ Error: {e}')
-        raise
-    finally:
-        cursor.close()
-        conn.close()
+                INSERT INTO employee_ranks (employee_id, year, month, current_rank_id, total_sales, notified)
+                SELECT
+                    m.employee_id, m.year, m.month,
+                    COALESCE(
+                        (SELECT r.id FROM ranks r
+                         WHERE r.min_amount <= m.total_sales AND r.max_amount > m.total_sales
+                           AND r.is_active = true
+                         ORDER BY r.min_amount LIMIT 1),
+                        (SELECT id FROM ranks WHERE name = 'Rookie')
+                    ),
+                    m.total_sales,
+                    TRUE
+                FROM (
+                    SELECT employee_id,
+                           EXTRACT(YEAR FROM date)::int AS year,
+                           EXTRACT(MONTH FROM date)::int AS month,
+                           SUM(total_sales) AS total_sales
+                    FROM shifts
+                    GROUP BY 1, 2, 3
+                ) m
+                ON CONFLICT (employee_id, year, month) DO UPDATE
+                SET current_rank_id = EXCLUDED.current_rank_id,
+                    total_sales = EXCLUDED.total_sales,
+                    updated_at = now()
+            """)
+            print(f"✓ Rebuilt {cursor.rowcount} employee_ranks rows from shifts")
+
+            conn.commit()
+            print(f"\n✅ Successfully imported {len(sheets_ranks)} ranks from Google Sheets to PostgreSQL")
+
+            # Verify
+            cursor.execute('SELECT name, min_amount, max_amount, emoji FROM ranks ORDER BY display_order')
+            db_ranks = cursor.fetchall()
+
+            print("\n📊 Ranks in PostgreSQL database:")
+            for rank in db_ranks:
+                print(f"  {rank['emoji']} {rank['name']}: ${rank['min_amount']:.0f} - ${rank['max_amount']:.0f}")
+
+        except Exception as e:
+            conn.rollback()
+            print(f'❌ Error: {e}')
+            raise
+        finally:
+            cursor.close()
 
 if __name__ == '__main__':
     main()
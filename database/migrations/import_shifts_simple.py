@@ -9,6 +9,9 @@ os.chdir('/home/lexun/Alex12060')
 from dotenv import load_dotenv
 load_dotenv()
 
+import csv
+import io
+
 import gspread
 import psycopg2
 from decimal import Decimal
@@ -40,11 +43,33 @@ records = ws.get_all_records()
 print(f"\nImporting {len(records)} shifts...")
 
 from config import Config
+from src.time_utils import parse_dt
 
-imported = 0
-skipped = 0
-
-for i, record in enumerate(records, 1):
+# Parse data safely
+def safe_decimal(val):
+    try:
+        return Decimal(str(val)) if val else Decimal('0')
+    except:
+        return Decimal('0')
+
+# COPY aborts the whole load on one bad timestamp, so check them here:
+# a malformed value raises and the row lands in errors
+def checked_timestamp(val):
+    if not val:
+        return None
+    parse_dt(str(val))
+    return val
+
+# Build CSV buffers in memory; rows that fail to parse are collected and printed once
+shifts_buf = io.StringIO()
+products_buf = io.StringIO()
+shifts_csv = csv.writer(shifts_buf)
+products_csv = csv.writer(products_buf)
+
+parsed = 0
+errors = []
+
+for record in records:
     try:
         shift_id = int(record.get('ID', 0))
         if shift_id == 0 or not record.get('Date'):
@@ -53,37 +78,17 @@ for i, record in enumerate(records, 1):
         employee_id = int(record.get('EmployeeId', 0))
         employee_name = record.get('EmployeeName', f'Employee {employee_id}')
 
-        # Ensure employee exists
-        cursor.execute("""
-            INSERT INTO employees (id, name, telegram_id, is_active)
-            VALUES (%s, %s, %s, true)
-            ON CONFLICT (id) DO NOTHING
-        """, (employee_id, employee_name, employee_id))
-
-        # Parse data safely
-        def safe_decimal(val):
-            try:
-                return Decimal(str(val)) if val else Decimal('0')
-            except:
-                return Decimal('0')
-
-        # Insert shift
-        cursor.execute("""
-            INSERT INTO shifts (
-                id, date, employee_id, employee_name,
-                clock_in, clock_out, worked_hours,
-                total_sales, net_sales, commission_pct,
-                total_per_hour, commissions, total_made
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ON CONFLICT (id) DO NOTHING
-            RETURNING id
-        """, (
+        shift_date = checked_timestamp(record.get('Date'))
+        clock_in = checked_timestamp(record.get('Clock in'))
+        clock_out = checked_timestamp(record.get('Clock out'))
+
+        shifts_csv.writerow([
             shift_id,
-            record.get('Date'),
+            shift_date,
             employee_id,
             employee_name,
-            record.get('Clock in'),
-            record.get('Clock out'),
+            clock_in,
+            clock_out,
             safe_decimal(record.get('Worked hours/shift')),
             safe_decimal(record.get('Total sales')),
             safe_decimal(record.get('Net sales')),
@@ -91,35 +96,94 @@ for i, record in enumerate(records, 1):
             safe_decimal(record.get('Total per hour')),
             safe_decimal(record.get('Commissions')),
             safe_decimal(record.get('Total made'))
-        ))
-
-        if cursor.fetchone():
-            # Import products
-            for product_name in Config.PRODUCTS:
-                amount = safe_decimal(record.get(product_name))
-                if amount > 0 and product_name in product_map:
-                    cursor.execute("""
-                        INSERT INTO shift_products (shift_id, product_id, amount)
-                        VALUES (%s, %s, %s)
-                        ON CONFLICT DO NOTHING
-                    """, (shift_id, product_map[product_name], amount))
-
-            imported += 1
-            db_conn.commit()  # Commit after each successful import
-
-            if i % 50 == 0:
-                print(f"  Progress: {i}/{len(records)}...")
-        else:
-            skipped += 1
+        ])
+
+        for product_name in Config.PRODUCTS:
+            amount = safe_decimal(record.get(product_name))
+            if amount > 0 and product_name in product_map:
+                products_csv.writerow([shift_id, product_map[product_name], amount])
+
+        parsed += 1
 
     except Exception as e:
-        print(f"  Error shift {shift_id}: {e}")
-        db_conn.rollback()  # Rollback this shift only
+        errors.append(f"  Error shift {record.get('ID')}: {e}")
+
+# COPY into temp tables, then one set-based insert: no per-row parse/commit
+cursor.execute("""
+    CREATE TEMP TABLE t_shifts (
+        id BIGINT, date TIMESTAMP, employee_id BIGINT, employee_name TEXT,
+        clock_in TIMESTAMP, clock_out TIMESTAMP, worked_hours NUMERIC,
+        total_sales NUMERIC, net_sales NUMERIC, commission_pct NUMERIC,
+        total_per_hour NUMERIC, commissions NUMERIC, total_made NUMERIC
+    ) ON COMMIT DROP;
+    CREATE TEMP TABLE t_shift_products (
+        shift_id BIGINT, product_id INT, amount NUMERIC
+    ) ON COMMIT DROP;
+""")
+shifts_buf.seek(0)
+products_buf.seek(0)
+# Unquoted empty CSV fields load as NULL (wanted for clock in/out); an empty
+# EmployeeName must stay '' as the old per-row INSERT stored it
+cursor.copy_expert(
+    "COPY t_shifts FROM STDIN WITH (FORMAT csv, FORCE_NOT_NULL (employee_name))", shifts_buf
+)
+cursor.copy_expert("COPY t_shift_products FROM STDIN WITH CSV", products_buf)
+
+# Ensure employees exist
+cursor.execute("""
+    INSERT INTO employees (id, name, telegram_id, is_active)
+    SELECT DISTINCT ON (employee_id) employee_id, employee_name, employee_id, true
+    FROM t_shifts
+    ORDER BY employee_id, id
+    ON CONFLICT (id) DO NOTHING
+""")
+
+# Insert shifts, and products only for shifts that were actually inserted
+cursor.execute("""
+    WITH inserted AS (
+        INSERT INTO shifts (
+            id, date, employee_id, employee_name,
+            clock_in, clock_out, worked_hours,
+            total_sales, net_sales, commission_pct,
+            total_per_hour, commissions, total_made
+        )
+        SELECT
+            id, date, employee_id, employee_name,
+            clock_in, clock_out, worked_hours,
+            total_sales, net_sales, commission_pct,
+            total_per_hour, commissions, total_made
+        FROM t_shifts
+        ON CONFLICT (id) DO NOTHING
+        RETURNING id
+    ), products AS (
+        INSERT INTO shift_products (shift_id, product_id, amount)
+        SELECT p.shift_id, p.product_id, p.amount
+        FROM t_shift_products p
+        JOIN inserted i ON i.id = p.shift_id
+        ON CONFLICT DO NOTHING
+    )
+    SELECT COUNT(*) FROM inserted
+""")
+imported = cursor.fetchone()[0]
+skipped = parsed - imported
+
+# Single commit for the whole import
+db_conn.commit()
 
-# Final commit
+# Shifts were inserted with explicit IDs: move the shifts.id sequence past MAX(id).
+# nextval() is where the sequence would go next, so GREATEST never moves it back
+cursor.execute("""
+    SELECT setval(seq, GREATEST(nextval(seq), (SELECT COALESCE(MAX(id), 0) + 1 FROM shifts)), false)
+    FROM pg_get_serial_sequence('shifts', 'id') AS seq
+    WHERE seq IS NOT NULL
+""")
 db_conn.commit()
+print("✓ Shifts sequence reset")
 db_conn.close()
 
+if errors:
+    print("\n".join(errors))
 print(f"\n✓ Imported: {imported} shifts")
 print(f"✓ Skipped: {skipped} (already exist)")
+print(f"✓ Errors: {len(errors)}")
 print("\n✅ Import completed!")
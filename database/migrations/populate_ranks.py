@@ -2,9 +2,7 @@
 
 This script adds the standard rank tiers to the PostgreSQL database.
 """
-import psycopg2
-from psycopg2 import extras
-from config import Config
+from services.postgres_service import get_connection
 
 # Rank data based on standard commission system
 ranks_data = [
@@ -54,38 +52,37 @@ ranks_data = [
 
 def main():
     """Populate ranks table."""
-    conn = psycopg2.connect(**Config.get_db_params(), cursor_factory=extras.RealDictCursor)
-    cursor = conn.cursor()
+    with get_connection() as conn:
+        cursor = conn.cursor()
 
-    try:
-        # Clear existing ranks
-        cursor.execute('DELETE FROM ranks')
-        print('Cleared existing ranks')
+        try:
+            # Clear existing ranks
+            cursor.execute('DELETE FROM ranks')
+            print('Cleared existing ranks')
 
-        # Insert ranks
-        for rank in ranks_data:
-            cursor.execute("""
-                INSERT INTO ranks (name, min_amount, max_amount, text, display_order, is_active)
-                VALUES (%(name)s, %(min_amount)s, %(max_amount)s, %(text)s, %(display_order)s, true)
-            """, rank)
+            # Insert ranks
+            for rank in ranks_data:
+                cursor.execute("""
+                    INSERT INTO ranks (name, min_amount, max_amount, text, display_order, is_active)
+                    VALUES (%(name)s, %(min_amount)s, %(max_amount)s, %(text)s, %(display_order)s, true)
+                """, rank)
 
-        conn.commit()
-        print(f'✓ Successfully inserted {len(ranks_data)} ranks')
+            conn.commit()
+            print(f'✓ Successfully inserted {len(ranks_data)} ranks')
 
-        # Verify
-        cursor.execute('SELECT name, min_amount, max_amount FROM ranks ORDER BY display_order')
-        ranks = cursor.fetchall()
-        print('\nRanks in database:')
-        for rank in ranks:
-            print(f'  {rank["name"]}: ${rank["min_amount"]:.0f} - ${rank["max_amount"]:.0f}')
+            # Verify
+            cursor.execute('SELECT name, min_amount, max_amount FROM ranks ORDER BY display_order')
+            ranks = cursor.fetchall()
+            print('\nRanks in database:')
+            for rank in ranks:
+                print(f'  {rank["name"]}: ${rank["min_amount"]:.0f} - ${rank["max_amount"]:.0f}')
 
-    except Exception as e:
-        conn.rollback()
-        print(f'✗ Error: {e}')
-        raise
-    finally:
-        cursor.close()
-        conn.close()
+        except Exception as e:
+            conn.rollback()
+            print(f'✗ Error: {e}')
+            raise
+        finally:
+            cursor.close()
 
 if __name__ == '__main__':
     main()
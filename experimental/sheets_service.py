@@ -1,13 +1,21 @@
 """Google Sheets service for shift data management."""
 
+import csv
+import io
 import logging
+import random
+import time
+from bisect import bisect_left
+from collections import defaultdict
 from typing import Dict, List, Optional
-from decimal import Decimal
+from decimal import Decimal, InvalidOperation
 
 import gspread
 from gspread.exceptions import APIError, WorksheetNotFound
+from gspread.utils import numericise_all, rowcol_to_a1
 
 from config import Config
+from services.sheets_client import get_sheets_client
 from src.time_utils import parse_dt
 
 logger = logging.getLogger(__name__)
@@ -16,15 +24,31 @@ logger = logging.getLogger(__name__)
 class SheetsService:
     """Service for managing shift data in Google Sheets."""
 
-    def __init__(self, cache_manager=None):
+    # Config sheets loaded together by prefetch_config()
+    CONFIG_SHEETS = ("EmployeeSettings", "DynamicRates", "Ranks")
+    # How long prefetched config records are served before re-reading (seconds)
+    PREFETCH_TTL = 900
+    # How long rows from prime_cache() and the build_indexes() index are served (seconds)
+    ROWS_CACHE_TTL = 60
+
+    def __init__(
+        self,
+        cache_manager=None,
+        client: Optional[gspread.Client] = None,
+        rng: Optional[random.Random] = None,
+    ):
         """Initialize sheets service with credentials from config.
 
         Args:
             cache_manager: Optional CacheManager instance for caching support.
                           If None, a dummy cache manager will be created.
+            client: Optional already authorized gspread client to reuse.
+                    If None, a new one is created from the service account.
+            rng: Optional random generator for model selection in complex
+                 bonuses. Pass a seeded random.Random for reproducible runs.
         """
         try:
-            self.client = gspread.service_account(filename=Config.GOOGLE_SA_JSON)
+            self.client = client or get_sheets_client()
             self.spreadsheet = self.client.open_by_key(Config.SPREADSHEET_ID)
             logger.info("Google Sheets client initialized successfully")
 
@@ -38,6 +62,19 @@ class SheetsService:
                 self.cache_manager = cache_manager
                 logger.info("Using CacheManager (caching enabled)")
 
+            # Shifts header row, filled by shift_headers / ensure_headers()
+            self._shift_headers: Optional[List[str]] = None
+            # (loaded_at, {sheet title: records}) filled by prefetch_config()
+            self._prefetched = None
+            # Shift-derived caches; all dropped together by invalidate_cache().
+            # {worksheet title: (loaded_at, records)} filled by prime_cache()
+            self._rows_cache: Dict[str, tuple] = {}
+            # (loaded_at, model lookup tables) filled by build_indexes()
+            self._shift_index = None
+            # Models sold per shift id, filled by get_models_from_shift()
+            self._models_cache: Dict[str, List[str]] = {}
+            self._rng = rng or random.Random()
+
         except Exception as e:
             logger.error(f"Failed to initialize Google Sheets client: {e}")
             raise
@@ -64,6 +101,17 @@ class SheetsService:
             logger.error(f"Failed to get worksheet: {e}")
             raise
 
+    @property
+    def shift_headers(self) -> List[str]:
+        """Header row of the shifts worksheet, fetched once per instance.
+
+        Returns:
+            List of header names.
+        """
+        if self._shift_headers is None:
+            self._shift_headers = self.get_worksheet().row_values(1)
+        return self._shift_headers
+
     def ensure_headers(self, ws: Optional[gspread.Worksheet] = None) -> None:
         """Ensure worksheet has correct headers.
 
@@ -89,6 +137,9 @@ class SheetsService:
                     # Update/sync headers
                     ws.update("A1", [expected_headers], value_input_option="RAW")
                     logger.info("Headers updated")
+
+            # Headers now match expected; reuse them instead of re-fetching
+            self._shift_headers = expected_headers
         except APIError as e:
             logger.error(f"Failed to ensure headers: {e}")
             raise
@@ -136,138 +187,214 @@ class SheetsService:
             self.ensure_headers(ws)
 
             shift_id = self.get_next_id()
-            headers = ws.row_values(1)
-
-            employee_id = shift_data["employee_id"]
-            clock_in = shift_data["clock_in"]
-            clock_out = shift_data["clock_out"]
-
-            # 1. Get employee settings
-            settings = self.get_employee_settings(employee_id)
-            if not settings:
-                # Create default settings
-                self.create_default_employee_settings(employee_id)
-                settings = {"Hourly wage": 15.0, "Sales commission": 8.0}
-
-            hourly_wage = Decimal(str(settings["Hourly wage"]))
-            base_commission = Decimal(str(settings["Sales commission"]))
-
-            # 2. Calculate worked hours
-            clock_in_dt = parse_dt(clock_in)
-            clock_out_dt = parse_dt(clock_out)
-            worked_hours = (clock_out_dt - clock_in_dt).total_seconds() / 3600
-            worked_hours_decimal = Decimal(str(worked_hours))
+            row = self._build_shift_row(shift_id, shift_data)
 
-            # 3. Calculate Total per hour
-            total_per_hour = worked_hours_decimal * hourly_wage
+            ws.append_row(row, value_input_option="RAW")
+            logger.info(f"Shift {shift_id} created successfully")
 
-            # 4. Calculate Total sales
-            products = shift_data.get("products", {})
-            total_sales = sum(Decimal(str(v)) for v in products.values())
+            # Invalidate cache: employee settings might have changed due to shift creation
+            self.cache_manager.invalidate_namespace("employee_settings")
+            self.invalidate_cache()
+            logger.debug(f"✗ Invalidated cache: employee_settings (shift {shift_id} created)")
 
-            # 5. Calculate Net sales (Total sales × 0.8)
-            net_sales = total_sales * Decimal("0.8")
+            return shift_id
+        except APIError as e:
+            logger.error(f"Failed to create shift: {e}")
+            raise
 
-            # 6. Calculate dynamic commission rate
-            shift_date = shift_data["date"]
-            dynamic_rate = Decimal(str(self.calculate_dynamic_rate(employee_id, shift_date, total_sales)))
+    def create_shifts_bulk(self, shifts_data: List[Dict]) -> List[int]:
+        """Create several shift records with a single append request.
 
-            # 7. Calculate total commission percentage
-            commission_percent = base_commission + dynamic_rate
+        Each shift is calculated exactly as in create_shift(); only the
+        write is batched. IDs are assigned consecutively.
 
-            # 8. Apply active bonuses (percent_next, double_commission, percent_prev, percent_all)
-            active_bonuses = self.get_active_bonuses(employee_id)
-            bonus_additions = Decimal("0")
+        Args:
+            shifts_data: List of dictionaries with shift information.
 
-            # Create temporary shift dict for complex bonuses
-            temp_shift = {
-                "Date": shift_date,
-                "Clock in": clock_in,
-                "EmployeeId": employee_id,
-            }
-            # Add products to temp shift
-            for product, amount in products.items():
-                temp_shift[product] = amount
-
-            for bonus in active_bonuses:
-                bonus_type = bonus.get("Bonus Type", "")
-                bonus_value = Decimal(str(bonus.get("Value", 0)))
-
-                if bonus_type == "percent_next":
-                    commission_percent += bonus_value
-                    self.apply_bonus(bonus.get("ID"), shift_id)
-                    logger.info(f"Applied percent_next bonus: +{bonus_value}%")
-
-                elif bonus_type == "double_commission":
-                    commission_percent *= Decimal("2")
-                    self.apply_bonus(bonus.get("ID"), shift_id)
-                    logger.info(f"Applied double_commission bonus")
-
-                elif bonus_type == "percent_prev":
-                    # Complex bonus: +X% from previous shift chatter
-                    prev_bonus = self.apply_percent_prev_bonus(employee_id, temp_shift, float(bonus_value))
-                    bonus_additions += prev_bonus
-                    self.apply_bonus(bonus.get("ID"), shift_id)
-                    logger.info(f"Applied percent_prev bonus: +${prev_bonus:.2f}")
-
-                elif bonus_type == "percent_all":
-                    # Complex bonus: +X% from all other chatters
-                    all_bonus = self.apply_percent_all_bonus(employee_id, temp_shift, float(bonus_value))
-                    bonus_additions += all_bonus
-                    self.apply_bonus(bonus.get("ID"), shift_id)
-                    logger.info(f"Applied percent_all bonus: +${all_bonus:.2f}")
-
-                elif bonus_type in ["flat", "flat_immediate"]:
-                    # Add to total_made at the end
-                    bonus_additions += bonus_value
-                    self.apply_bonus(bonus.get("ID"), shift_id)
-                    logger.info(f"Applied flat bonus: +${bonus_value}")
-
-            # 9. Calculate Commissions
-            commissions = net_sales * (commission_percent / Decimal("100"))
+        Returns:
+            Created shift IDs, in input order.
 
-            # 10. Calculate Total made
-            total_made = commissions + total_per_hour + bonus_additions
-
-            # Build row data
-            row_data = {
-                "ID": shift_id,
-                "Date": shift_data["date"],
-                "EmployeeId": shift_data["employee_id"],
-                "EmployeeName": shift_data["employee_name"],
-                "Clock in": clock_in,
-                "Clock out": clock_out,
-                "Worked hours/shift": f"{worked_hours:.2f}",
-                "Total sales": f"{total_sales:.2f}",
-                "Net sales": f"{net_sales:.2f}",
-                "%": f"{commission_percent:.2f}",
-                "Total per hour": f"{total_per_hour:.2f}",
-                "Commissions": f"{commissions:.2f}",
-                "Total made": f"{total_made:.2f}",
-            }
+        Raises:
+            APIError: If failed to create shifts.
+        """
+        if not shifts_data:
+            return []
 
-            # Add product values
-            for product, amount in products.items():
-                row_data[product] = f"{Decimal(str(amount)):.2f}"
+        try:
+            ws = self.get_worksheet()
+            self.ensure_headers(ws)
 
-            # Build row in correct order
-            row = [row_data.get(h, "") for h in headers]
+            first_id = self.get_next_id()
+            shift_ids = list(range(first_id, first_id + len(shifts_data)))
+            # Daily totals read once and advanced per shift, so earlier shifts
+            # of the batch count towards the dynamic rate of later ones
+            daily_sales = self._daily_sales_totals(self._get_shift_records())
+            rows = [
+                self._build_shift_row(shift_id, shift_data, daily_sales)
+                for shift_id, shift_data in zip(shift_ids, shifts_data)
+            ]
 
-            ws.append_row(row, value_input_option="RAW")
-            logger.info(f"Shift {shift_id} created successfully")
-            logger.info(f"  Worked hours: {worked_hours:.2f}, Total per hour: ${total_per_hour:.2f}")
-            logger.info(f"  Commission %: {commission_percent:.2f}%, Commissions: ${commissions:.2f}")
-            logger.info(f"  Total made: ${total_made:.2f}")
+            ws.append_rows(rows, value_input_option="RAW")
+            logger.info(f"Shifts {shift_ids} created successfully")
 
             # Invalidate cache: employee settings might have changed due to shift creation
             self.cache_manager.invalidate_namespace("employee_settings")
-            logger.debug(f"✗ Invalidated cache: employee_settings (shift {shift_id} created)")
+            self.invalidate_cache()
+            logger.debug(f"✗ Invalidated cache: employee_settings (shifts {shift_ids} created)")
 
-            return shift_id
+            return shift_ids
         except APIError as e:
-            logger.error(f"Failed to create shift: {e}")
+            logger.error(f"Failed to create shifts: {e}")
             raise
 
+    def _build_shift_row(
+        self,
+        shift_id: int,
+        shift_data: Dict,
+        daily_sales: Optional[Dict[tuple, Decimal]] = None,
+    ) -> List:
+        """Calculate a shift and build its row in header order.
+
+        Applies the employee's active bonuses against shift_id.
+
+        Args:
+            shift_id: ID assigned to the shift.
+            shift_data: Dictionary with shift information.
+            daily_sales: Optional running totals from _daily_sales_totals().
+                         If given, the dynamic rate is taken from it (and the
+                         shift's sales added to it) instead of re-reading the sheet.
+
+        Returns:
+            Row values ordered by shift_headers.
+        """
+        headers = self.shift_headers
+
+        employee_id = shift_data["employee_id"]
+        clock_in = shift_data["clock_in"]
+        clock_out = shift_data["clock_out"]
+
+        # 1. Get employee settings
+        settings = self.get_employee_settings(employee_id)
+        if not settings:
+            # Create default settings
+            self.create_default_employee_settings(employee_id)
+            settings = {"Hourly wage": 15.0, "Sales commission": 8.0}
+
+        hourly_wage = Decimal(str(settings["Hourly wage"]))
+        base_commission = Decimal(str(settings["Sales commission"]))
+
+        # 2. Calculate worked hours
+        clock_in_dt = parse_dt(clock_in)
+        clock_out_dt = parse_dt(clock_out)
+        worked_hours = (clock_out_dt - clock_in_dt).total_seconds() / 3600
+        worked_hours_decimal = Decimal(str(worked_hours))
+
+        # 3. Calculate Total per hour
+        total_per_hour = worked_hours_decimal * hourly_wage
+
+        # 4. Calculate Total sales
+        products = shift_data.get("products", {})
+        total_sales = sum(Decimal(str(v)) for v in products.values())
+
+        # 5. Calculate Net sales (Total sales × 0.8)
+        net_sales = total_sales * Decimal("0.8")
+
+        # 6. Calculate dynamic commission rate
+        shift_date = shift_data["date"]
+        if daily_sales is None:
+            dynamic_rate = Decimal(str(self.calculate_dynamic_rate(employee_id, shift_date, total_sales)))
+        else:
+            day_key = (str(employee_id), shift_date.partition(" ")[0])
+            dynamic_rate = Decimal(str(self._rate_for_daily_total(daily_sales[day_key] + total_sales)))
+            daily_sales[day_key] += total_sales
+
+        # 7. Calculate total commission percentage
+        commission_percent = base_commission + dynamic_rate
+
+        # 8. Apply active bonuses (percent_next, double_commission, percent_prev, percent_all)
+        active_bonuses = self.get_active_bonuses(employee_id)
+        bonus_additions = Decimal("0")
+
+        # Create temporary shift dict for complex bonuses
+        temp_shift = {
+            "Date": shift_date,
+            "Clock in": clock_in,
+            "EmployeeId": employee_id,
+        }
+        # Add products to temp shift
+        for product, amount in products.items():
+            temp_shift[product] = amount
+
+        for bonus in active_bonuses:
+            bonus_type = bonus.get("Bonus Type", "")
+            bonus_value = Decimal(str(bonus.get("Value", 0)))
+
+            if bonus_type == "percent_next":
+                commission_percent += bonus_value
+                self.apply_bonus(bonus.get("ID"), shift_id)
+                logger.info(f"Applied percent_next bonus: +{bonus_value}%")
+
+            elif bonus_type == "double_commission":
+                commission_percent *= Decimal("2")
+                self.apply_bonus(bonus.get("ID"), shift_id)
+                logger.info(f"Applied double_commission bonus")
+
+            elif bonus_type == "percent_prev":
+                # Complex bonus: +X% from previous shift chatter
+                prev_bonus = self.apply_percent_prev_bonus(employee_id, temp_shift, float(bonus_value))
+                bonus_additions += prev_bonus
+                self.apply_bonus(bonus.get("ID"), shift_id)
+                logger.info(f"Applied percent_prev bonus: +${prev_bonus:.2f}")
+
+            elif bonus_type == "percent_all":
+                # Complex bonus: +X% from all other chatters
+                all_bonus = self.apply_percent_all_bonus(employee_id, temp_shift, float(bonus_value))
+                bonus_additions += all_bonus
+                self.apply_bonus(bonus.get("ID"), shift_id)
+                logger.info(f"Applied percent_all bonus: +${all_bonus:.2f}")
+
+            elif bonus_type in ["flat", "flat_immediate"]:
+                # Add to total_made at the end
+                bonus_additions += bonus_value
+                self.apply_bonus(bonus.get("ID"), shift_id)
+                logger.info(f"Applied flat bonus: +${bonus_value}")
+
+        # 9. Calculate Commissions
+        commissions = net_sales * (commission_percent / Decimal("100"))
+
+        # 10. Calculate Total made
+        total_made = commissions + total_per_hour + bonus_additions
+
+        # Build row data
+        row_data = {
+            "ID": shift_id,
+            "Date": shift_data["date"],
+            "EmployeeId": shift_data["employee_id"],
+            "EmployeeName": shift_data["employee_name"],
+            "Clock in": clock_in,
+            "Clock out": clock_out,
+            "Worked hours/shift": f"{worked_hours:.2f}",
+            "Total sales": f"{total_sales:.2f}",
+            "Net sales": f"{net_sales:.2f}",
+            "%": f"{commission_percent:.2f}",
+            "Total per hour": f"{total_per_hour:.2f}",
+            "Commissions": f"{commissions:.2f}",
+            "Total made": f"{total_made:.2f}",
+        }
+
+        # Add product values
+        for product, amount in products.items():
+            row_data[product] = f"{Decimal(str(amount)):.2f}"
+
+        # Build row in correct order
+        row = [row_data.get(h, "") for h in headers]
+
+        logger.info(f"  Worked hours: {worked_hours:.2f}, Total per hour: ${total_per_hour:.2f}")
+        logger.info(f"  Commission %: {commission_percent:.2f}%, Commissions: ${commissions:.2f}")
+        logger.info(f"  Total made: ${total_made:.2f}")
+
+        return row
+
     def find_row_by_id(self, shift_id: int) -> Optional[int]:
         """Find row number by shift ID.
 
@@ -293,6 +420,60 @@ class SheetsService:
             logger.error(f"Failed to find row by ID: {e}")
             raise
 
+    def delete_shifts(self, shift_ids: List[int]) -> int:
+        """Delete shift rows by ID with a single batch request.
+
+        Args:
+            shift_ids: Shift IDs to delete. Unknown IDs are ignored.
+
+        Returns:
+            Number of rows deleted.
+
+        Raises:
+            APIError: If failed to delete shifts.
+        """
+        try:
+            ws = self.get_worksheet()
+            wanted = {int(shift_id) for shift_id in shift_ids}
+            ids = ws.col_values(1)[1:]  # Skip header
+
+            rows = []
+            for idx, id_str in enumerate(ids, start=2):
+                try:
+                    if int(id_str.strip()) in wanted:
+                        rows.append(idx)
+                except (ValueError, AttributeError):
+                    continue
+
+            if not rows:
+                return 0
+
+            # Bottom-up so earlier deletions don't shift later row indexes
+            requests = [
+                {
+                    "deleteDimension": {
+                        "range": {
+                            "sheetId": ws.id,
+                            "dimension": "ROWS",
+                            "startIndex": row - 1,
+                            "endIndex": row,
+                        }
+                    }
+                }
+                for row in sorted(rows, reverse=True)
+            ]
+            self.spreadsheet.batch_update({"requests": requests})
+            logger.info(f"Deleted {len(rows)} shift rows")
+
+            for shift_id in wanted:
+                self.cache_manager.invalidate_key("shift", str(shift_id))
+            self.invalidate_cache()
+
+            return len(rows)
+        except APIError as e:
+            logger.error(f"Failed to delete shifts: {e}")
+            raise
+
     def get_shift_by_id(self, shift_id: int) -> Optional[Dict]:
         """Get shift data by ID.
 
@@ -353,6 +534,7 @@ class SheetsService:
 
             # Invalidate cache: shift was updated
             self.cache_manager.invalidate_key("shift", str(shift_id))
+            self.invalidate_cache()
             logger.debug(f"✗ Invalidated cache: shift[{shift_id}] (field '{field}' updated)")
 
             return True
@@ -499,6 +681,136 @@ class SheetsService:
             logger.error(f"Failed to get all shifts: {e}")
             raise
 
+    def get_all_shifts_fast(self) -> List[Dict]:
+        """Get all shifts via the sheet's CSV export.
+
+        Same records as get_all_shifts(), but downloads the Shifts sheet as
+        CSV, which is much smaller than the values API JSON for large sheets.
+
+        Returns:
+            List of all shift dictionaries.
+        """
+        try:
+            ws = self.get_worksheet()
+            url = (
+                f"https://docs.google.com/spreadsheets/d/{self.spreadsheet.id}"
+                f"/export?format=csv&gid={ws.id}"
+            )
+            response = self.client.http_client.request("get", url)
+
+            rows = csv.reader(io.StringIO(response.content.decode("utf-8")))
+            headers = next(rows, [])
+            return [dict(zip(headers, numericise_all(row))) for row in rows]
+        except APIError as e:
+            logger.error(f"Failed to export shifts: {e}")
+            raise
+
+    # ==================== Config Prefetch ====================
+
+    def prefetch_config(self) -> Dict[str, List[Dict]]:
+        """Load EmployeeSettings, DynamicRates and Ranks in one values.batchGet.
+
+        Opt-in: until this is called, config sheets are read on every call.
+        The records are kept in memory for PREFETCH_TTL seconds and served by
+        get_employee_settings(), get_dynamic_rates() and get_ranks() instead
+        of one request per sheet. Writes to a config sheet through this
+        service drop that sheet from the prefetch.
+
+        Returns:
+            Dict mapping sheet title to its records (as from get_all_records).
+        """
+        response = self.spreadsheet.values_batch_get(
+            ranges=[f"{title}!A:Z" for title in self.CONFIG_SHEETS]
+        )
+
+        prefetched = {}
+        for title, value_range in zip(self.CONFIG_SHEETS, response["valueRanges"]):
+            values = value_range.get("values", [])
+            headers = values[0] if values else []
+            prefetched[title] = [
+                dict(zip(headers, numericise_all(row + [""] * (len(headers) - len(row)))))
+                for row in values[1:]
+            ]
+
+        self._prefetched = (time.monotonic(), prefetched)
+        return prefetched
+
+    def _get_config_records(self, title: str) -> List[Dict]:
+        """Get records of a config sheet, from the prefetch if still fresh.
+
+        Args:
+            title: Worksheet title.
+
+        Returns:
+            List of record dicts.
+        """
+        if self._prefetched is not None:
+            loaded_at, prefetched = self._prefetched
+            if title in prefetched and time.monotonic() - loaded_at < self.PREFETCH_TTL:
+                return prefetched[title]
+
+        return self.spreadsheet.worksheet(title).get_all_records()
+
+    def _drop_prefetched(self, title: str) -> None:
+        """Drop a config sheet from the prefetch so the next read hits the sheet.
+
+        Args:
+            title: Worksheet title.
+        """
+        if self._prefetched is not None:
+            self._prefetched[1].pop(title, None)
+
+    # ==================== Rows Cache ====================
+
+    def prime_cache(self, title: Optional[str] = None) -> List[Dict]:
+        """Load all records of a worksheet and keep them for ROWS_CACHE_TTL seconds.
+
+        Opt-in: until this is called, shift lookups read the sheet every time.
+
+        Args:
+            title: Worksheet title. Defaults to the shifts worksheet.
+
+        Returns:
+            List of record dicts.
+        """
+        title = title or Config.SHEET_NAME
+        ws = self.get_worksheet() if title == Config.SHEET_NAME else self.spreadsheet.worksheet(title)
+        records = ws.get_all_records()
+        self._rows_cache[title] = (time.monotonic(), records)
+        return records
+
+    def invalidate_cache(self, title: Optional[str] = None) -> None:
+        """Drop rows loaded by prime_cache() and everything derived from them.
+
+        Every shift write calls this, so the model index (build_indexes())
+        and the per-shift models cache are dropped along with the shift rows.
+
+        Args:
+            title: Worksheet title to drop. If None, drops all cached worksheets.
+        """
+        if title is None:
+            self._rows_cache.clear()
+        else:
+            self._rows_cache.pop(title, None)
+
+        if title is None or title == Config.SHEET_NAME:
+            self._shift_index = None
+            self._models_cache.clear()
+
+    def _get_shift_records(self) -> List[Dict]:
+        """Get all shift records, from the rows cache if primed and still fresh.
+
+        Returns:
+            List of record dicts.
+        """
+        cached = self._rows_cache.get(Config.SHEET_NAME)
+        if cached is not None:
+            loaded_at, records = cached
+            if time.monotonic() - loaded_at < self.ROWS_CACHE_TTL:
+                return records
+
+        return self.get_worksheet().get_all_records()
+
     # ==================== EmployeeSettings Methods ====================
 
     def get_employee_settings(self, employee_id: int) -> Optional[Dict]:
@@ -511,8 +823,7 @@ class SheetsService:
             Dict with 'Hourly wage' and 'Sales commission' or None if not found.
         """
         try:
-            ws = self.spreadsheet.worksheet("EmployeeSettings")
-            all_records = ws.get_all_records()
+            all_records = self._get_config_records("EmployeeSettings")
 
             for record in all_records:
                 if str(record.get("EmployeeId")) == str(employee_id):
@@ -537,6 +848,7 @@ class SheetsService:
             ws = self.spreadsheet.worksheet("EmployeeSettings")
             default_data = [str(employee_id), "15.00", "8.0"]
             ws.append_row(default_data, value_input_option="RAW")
+            self._drop_prefetched("EmployeeSettings")
             logger.info(f"Default employee settings created for {employee_id}")
         except (WorksheetNotFound, APIError) as e:
             logger.error(f"Failed to create employee settings: {e}")
@@ -557,8 +869,7 @@ class SheetsService:
 
         logger.debug("✗ Cache MISS: dynamic_rates")
         try:
-            ws = self.spreadsheet.worksheet("DynamicRates")
-            records = ws.get_all_records()
+            records = self._get_config_records("DynamicRates")
 
             rates = []
             for record in records:
@@ -588,46 +899,58 @@ class SheetsService:
             Dynamic percentage rate.
         """
         try:
-            # Get all shifts for employee on this date
-            ws = self.get_worksheet()
-            all_records = ws.get_all_records()
-
             # Extract date part (YYYY/MM/DD) from shift_date
-            date_part = shift_date.split(" ")[0] if " " in shift_date else shift_date
+            date_part = shift_date.partition(" ")[0]
 
             # Sum Total sales for the day (from existing shifts)
-            total_sales_today = Decimal("0")
-            for record in all_records:
-                if str(record.get("EmployeeId")) == str(employee_id):
-                    record_date = record.get("Date", "")
-                    record_date_part = record_date.split(" ")[0] if " " in record_date else record_date
+            daily_sales = self._daily_sales_totals(self.get_worksheet().get_all_records())
+            total_sales_today = daily_sales[(str(employee_id), date_part)] + current_total_sales
 
-                    if record_date_part == date_part:
-                        sales = record.get("Total sales", 0)
-                        if sales:
-                            try:
-                                total_sales_today += Decimal(str(sales))
-                            except:
-                                pass
+            return self._rate_for_daily_total(total_sales_today)
+        except Exception as e:
+            logger.error(f"Failed to calculate dynamic rate: {e}")
+            return 0.0
 
-            # Add current shift's Total sales
-            total_sales_today += current_total_sales
+    @staticmethod
+    def _daily_sales_totals(records: List[Dict]) -> Dict[tuple, Decimal]:
+        """Sum Total sales per employee and day in one pass.
 
-            # Find matching rate range
-            rates = self.get_dynamic_rates()
-            for rate in rates:
-                min_amt = Decimal(str(rate["Min Amount"]))
-                max_amt = Decimal(str(rate["Max Amount"]))
+        Args:
+            records: Shift records (as from get_all_records).
 
-                if min_amt <= total_sales_today < max_amt:
-                    return rate["Percentage"]
+        Returns:
+            defaultdict mapping (employee id str, YYYY/MM/DD) to Decimal total.
+        """
+        totals = defaultdict(Decimal)
+        for record in records:
+            sales = record.get("Total sales", 0)
+            if not sales:
+                continue
+            try:
+                amount = Decimal(str(sales))
+            except (ValueError, TypeError, InvalidOperation):
+                continue
+            record_date = str(record.get("Date", ""))
+            totals[(str(record.get("EmployeeId")), record_date.partition(" ")[0])] += amount
+        return totals
+
+    def _rate_for_daily_total(self, total_sales_today: Decimal) -> float:
+        """Find the DynamicRates percentage for a day's total sales.
 
-            return 0.0
-        except Exception as e:
-            logger.error(f"Failed to calculate dynamic rate: {e}")
-            return 0.0
+        Args:
+            total_sales_today: Employee's total sales for the day.
 
-    # ==================== Ranks Methods ====================
+        Returns:
+            Dynamic percentage rate, 0.0 if no range matches.
+        """
+        for rate in self.get_dynamic_rates():
+            min_amt = Decimal(str(rate["Min Amount"]))
+            max_amt = Decimal(str(rate["Max Amount"]))
+
+            if min_amt <= total_sales_today < max_amt:
+                return rate["Percentage"]
+
+        return 0.0
 
     def get_ranks(self) -> List[Dict]:
         """Get all rank definitions.
@@ -643,8 +966,7 @@ class SheetsService:
 
         logger.debug("✗ Cache MISS: ranks")
         try:
-            ws = self.spreadsheet.worksheet("Ranks")
-            records = ws.get_all_records()
+            records = self._get_config_records("Ranks")
 
             # Cache for 15 minutes (rarely changes)
             self.cache_manager.set("ranks", "all", records, ttl=900)
@@ -685,20 +1007,29 @@ class SheetsService:
                         except:
                             pass
 
-            # Find matching rank
-            ranks = self.get_ranks()
-            for rank in ranks:
-                min_amt = float(rank.get("Min Amount", 0))
-                max_amt = float(rank.get("Max Amount", 999999))
-
-                if min_amt <= float(total_sales_month) < max_amt:
-                    return rank.get("Rank Name", "Rookie")
-
-            return "Rookie"
+            return self.rank_for_sales(total_sales_month)
         except Exception as e:
             logger.error(f"Failed to determine rank: {e}")
             return "Rookie"
 
+    def rank_for_sales(self, total_sales: Decimal) -> str:
+        """Pick the rank whose [Min Amount, Max Amount) range contains total_sales.
+
+        Args:
+            total_sales: Total sales for the month.
+
+        Returns:
+            Rank name, 'Rookie' if no range matches.
+        """
+        for rank in self.get_ranks():
+            min_amt = float(rank.get("Min Amount", 0))
+            max_amt = float(rank.get("Max Amount", 999999))
+
+            if min_amt <= float(total_sales) < max_amt:
+                return rank.get("Rank Name", "Rookie")
+
+        return "Rookie"
+
     def get_rank_bonuses(self, rank_name: str) -> List[str]:
         """Get list of bonuses for a rank.
 
@@ -824,38 +1155,121 @@ class SheetsService:
             if row_idx:
                 # Update existing record
                 headers = ws.row_values(1)
-                updates = [
-                    ("Current Rank", new_rank),
-                    ("Previous Rank", previous_rank),
-                    ("Notified", "false"),
-                    ("Last Updated", last_updated),
-                ]
-
-                for field, value in updates:
-                    if field in headers:
-                        col_idx = headers.index(field) + 1
-                        col_letter = chr(64 + col_idx)
-                        cell_range = f"{col_letter}{row_idx}"
-                        ws.update(values=[[value]], range_name=cell_range, value_input_option="RAW")
+                for cell_range, value in self._employee_rank_cells(
+                    headers, row_idx, new_rank, previous_rank, last_updated
+                ):
+                    ws.update(values=[[value]], range_name=cell_range, value_input_option="RAW")
 
                 logger.info(f"Updated rank for employee {employee_id} to {new_rank}")
             else:
                 # Create new record
-                new_row = [
-                    str(employee_id),
-                    new_rank,
-                    "Rookie",
-                    month,
-                    year,
-                    "false",
-                    last_updated
-                ]
+                new_row = self._employee_rank_row(employee_id, new_rank, year, month, last_updated)
                 ws.append_row(new_row, value_input_option="RAW")
                 logger.info(f"Created rank record for employee {employee_id}: {new_rank}")
 
         except (WorksheetNotFound, APIError) as e:
             logger.error(f"Failed to update employee rank: {e}")
 
+    @staticmethod
+    def _employee_rank_cells(
+        headers: List[str],
+        row_idx: int,
+        new_rank: str,
+        previous_rank: str,
+        last_updated: str
+    ) -> List[tuple]:
+        """Cells to write when an existing EmployeeRanks record changes rank.
+
+        Returns:
+            List of (A1 cell, value) for the columns present in headers.
+        """
+        updates = [
+            ("Current Rank", new_rank),
+            ("Previous Rank", previous_rank),
+            ("Notified", "false"),
+            ("Last Updated", last_updated),
+        ]
+        return [
+            (rowcol_to_a1(row_idx, headers.index(field) + 1), value)
+            for field, value in updates
+            if field in headers
+        ]
+
+    @staticmethod
+    def _employee_rank_row(employee_id, new_rank: str, year: int, month: int, last_updated: str) -> List:
+        """Row for a new EmployeeRanks record (previous rank starts as Rookie)."""
+        return [str(employee_id), new_rank, "Rookie", month, year, "false", last_updated]
+
+    def update_employee_ranks_bulk(
+        self,
+        employee_months: Dict[tuple, List[Dict]],
+        last_updated: str
+    ) -> Dict[tuple, Dict]:
+        """Recompute and store ranks for many employee-months from pre-fetched shifts.
+
+        Same rules as determine_rank() and update_employee_rank(), but
+        EmployeeRanks is read once and all writes go out in one batch update.
+        Existing records are only written when the rank changed.
+
+        Args:
+            employee_months: Shift records keyed by (employee_id, year, month).
+            last_updated: Timestamp string.
+
+        Returns:
+            Dict keyed like employee_months with {"new_rank", "changed",
+            "created"}, or {"error": message} if that employee-month failed.
+        """
+        ws = self.spreadsheet.worksheet("EmployeeRanks")
+        rows = ws.get_all_values()
+        headers = rows[0] if rows else []
+
+        # Existing records by (employee, year, month)
+        existing = {}
+        for row_idx, row in enumerate(rows[1:], start=2):
+            record = dict(zip(headers, row))
+            key = (str(record.get("EmployeeId")), str(record.get("Year")), str(record.get("Month")))
+            existing[key] = (row_idx, record)
+
+        data = []
+        results = {}
+        next_row = len(rows) + 1
+        for key, shifts in employee_months.items():
+            employee_id, year, month = key
+            try:
+                total_sales = sum(
+                    (Decimal(str(s.get("Total sales"))) for s in shifts if s.get("Total sales")),
+                    Decimal("0"),
+                )
+                new_rank = self.rank_for_sales(total_sales)
+
+                current = existing.get((str(employee_id), str(year), str(month)))
+                if current:
+                    row_idx, record = current
+                    current_rank = record.get("Current Rank") or "Rookie"
+                    changed = current_rank != new_rank
+                    if changed:
+                        for cell_range, value in self._employee_rank_cells(
+                            headers, row_idx, new_rank, current_rank, last_updated
+                        ):
+                            data.append({"range": f"EmployeeRanks!{cell_range}", "values": [[value]]})
+                    results[key] = {"new_rank": new_rank, "changed": changed, "created": False}
+                else:
+                    data.append({
+                        "range": f"EmployeeRanks!A{next_row}",
+                        "values": [self._employee_rank_row(employee_id, new_rank, year, month, last_updated)],
+                    })
+                    next_row += 1
+                    results[key] = {"new_rank": new_rank, "changed": True, "created": True}
+            except (InvalidOperation, ValueError, TypeError) as e:
+                logger.error(f"Failed to update rank for {employee_id} {year}/{month}: {e}")
+                results[key] = {"error": str(e)}
+
+        if data:
+            self.spreadsheet.values_batch_update({"valueInputOption": "RAW", "data": data})
+            self.cache_manager.invalidate_namespace("employee_rank")
+
+        return results
+
     def mark_rank_notified(self, employee_id: int, year: int, month: int) -> None:
         """Mark employee rank as notified.
 
@@ -1036,12 +1450,20 @@ class SheetsService:
     def get_models_from_shift(self, shift: Dict) -> List[str]:
         """Extract model names that have sales > 0 from shift.
 
+        Results for records with an ID are cached per shift id until shifts
+        are written through this service (see invalidate_cache()).
+
         Args:
             shift: Shift record dictionary.
 
         Returns:
             List of model names (e.g., ['Model A', 'Model B']).
         """
+        shift_id = shift.get("ID")
+        cache_key = str(shift_id) if shift_id not in (None, "") else None
+        if cache_key is not None and cache_key in self._models_cache:
+            return list(self._models_cache[cache_key])
+
         models = []
         for key, value in shift.items():
             if key in Config.PRODUCTS:
@@ -1050,7 +1472,55 @@ class SheetsService:
                         models.append(key)
                 except (ValueError, TypeError, InvalidOperation):
                     continue
-        return models
+
+        if cache_key is not None:
+            self._models_cache[cache_key] = models
+        return list(models)
+
+    def build_indexes(self, records: Optional[List[Dict]] = None) -> None:
+        """Index shifts by model once so model lookups skip the full-sheet scan.
+
+        After this call find_previous_shift_with_models() and
+        find_shifts_with_model() answer from the index instead of re-reading
+        the Shifts sheet. Like the rows cache, the index expires after
+        ROWS_CACHE_TTL seconds and is dropped by invalidate_cache() on writes.
+
+        Args:
+            records: Shift records to index. If None, read via _get_shift_records().
+        """
+        if records is None:
+            records = self._get_shift_records()
+
+        by_model = defaultdict(list)
+        by_model_day = defaultdict(list)
+        for record in records:
+            date_part = str(record.get("Date", "")).partition(" ")[0]
+            for model in self.get_models_from_shift(record):
+                by_model[model].append(record)
+                by_model_day[(model, date_part)].append(record)
+
+        # Per model: shifts sorted by date plus the parallel list of dates for bisect
+        sorted_by_model = {}
+        for model, shifts in by_model.items():
+            shifts.sort(key=lambda x: str(x.get("Date", "")))
+            sorted_by_model[model] = ([str(s.get("Date", "")) for s in shifts], shifts)
+
+        self._shift_index = (time.monotonic(), {
+            "by_model": sorted_by_model,
+            "by_model_day": dict(by_model_day),
+        })
+
+    def _get_shift_index(self) -> Optional[Dict]:
+        """Get the model index if built and still fresh.
+
+        Returns:
+            Index dict from build_indexes() or None.
+        """
+        if self._shift_index is not None:
+            built_at, index = self._shift_index
+            if time.monotonic() - built_at < self.ROWS_CACHE_TTL:
+                return index
+        return None
 
     def find_previous_shift_with_models(
         self,
@@ -1068,9 +1538,21 @@ class SheetsService:
         Returns:
             Shift record dictionary or None.
         """
+        index = self._get_shift_index()
+        if index is not None:
+            # Latest shift before before_date per model, then the latest across models
+            best = None
+            for model in models:
+                dates, shifts = index["by_model"].get(model, ([], []))
+                for i in range(bisect_left(dates, before_date) - 1, -1, -1):
+                    if str(shifts[i].get("EmployeeId")) != str(employee_id):
+                        if best is None or dates[i] > str(best.get("Date", "")):
+                            best = shifts[i]
+                        break
+            return best
+
         try:
-            ws = self.get_worksheet()
-            all_records = ws.get_all_records()
+            all_records = self._get_shift_records()
 
             # Filter and sort shifts
             candidate_shifts = []
@@ -1128,12 +1610,19 @@ class SheetsService:
         Returns:
             List of shift records.
         """
-        try:
-            ws = self.get_worksheet()
-            all_records = ws.get_all_records()
+        # Extract date part
+        date_part = date.partition(" ")[0]
+
+        index = self._get_shift_index()
+        if index is not None:
+            return [
+                record for record in index["by_model_day"].get((model, date_part), [])
+                if str(record.get("EmployeeId")) != str(exclude_employee)
+                and str(record.get("Date", "")) < before_time
+            ]
 
-            # Extract date part
-            date_part = date.split(" ")[0] if " " in date else date
+        try:
+            all_records = self._get_shift_records()
 
             matching_shifts = []
             for record in all_records:
@@ -1143,7 +1632,7 @@ class SheetsService:
 
                 # Check if same date
                 shift_date = str(record.get("Date", ""))
-                shift_date_part = shift_date.split(" ")[0] if " " in shift_date else shift_date
+                shift_date_part = shift_date.partition(" ")[0]
                 if shift_date_part != date_part:
                     continue
 
@@ -1183,8 +1672,6 @@ class SheetsService:
             Bonus amount in $.
         """
         try:
-            import random
-
             # 1. Get models from current shift
             current_models = self.get_models_from_shift(current_shift)
             if not current_models:
@@ -1206,13 +1693,14 @@ class SheetsService:
             prev_models = self.get_models_from_shift(prev_shift)
 
             # 4. Find common models
-            common_models = list(set(current_models) & set(prev_models))
+            # Sorted so a seeded rng picks the same model on every run
+            common_models = sorted(set(current_models) & set(prev_models))
             if not common_models:
                 logger.info("No common models for percent_prev bonus")
                 return Decimal("0")
 
             # 5. Select random model
-            selected_model = random.choice(common_models)
+            selected_model = self._rng.choice(common_models)
             logger.info(f"Selected model for percent_prev bonus: {selected_model}")
 
             # 6. Calculate Net sales for model
@@ -1248,8 +1736,6 @@ class SheetsService:
             Bonus amount in $.
         """
         try:
-            import random
-
             # 1. Get models from current shift
             current_models = self.get_models_from_shift(current_shift)
             if not current_models:
@@ -1257,7 +1743,7 @@ class SheetsService:
                 return Decimal("0")
 
             # 2. Select random model
-            selected_model = random.choice(current_models)
+            selected_model = self._rng.choice(current_models)
             logger.info(f"Selected model for percent_all bonus: {selected_model}")
 
             # 3. Find all shifts with this model today
@@ -25,7 +25,7 @@ from pathlib import Path
 from collections import deque
 from functools import wraps
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 import gspread
 from gspread.exceptions import APIError
 from google.oauth2.service_account import Credentials
@@ -212,7 +212,10 @@ class PostgresSyncWorker:
             return False
 
     def _get_pending_syncs(self) -> list:
-        """Get all pending sync records from sync_queue.
+        """Get and lock a batch of pending sync records from sync_queue.
+
+        Rows are locked FOR UPDATE SKIP LOCKED until _mark_results() commits,
+        so several workers can run side by side without taking the same rows.
 
         Returns:
             List of sync records (dicts)
@@ -229,6 +232,7 @@ class PostgresSyncWorker:
                     WHERE status = 'pending'
                     ORDER BY created_at ASC
                     LIMIT 100
+                    FOR UPDATE SKIP LOCKED
                 """)
                 return cur.fetchall()
 
@@ -267,352 +271,363 @@ class PostgresSyncWorker:
                 else:
                     raise
 
-    def _sync_shift(self, record_id: int, operation: str, data: dict):
-        """Sync a shift record to Google Sheets.
+    # Worksheet, last column and row builder per synced table
+    SYNC_TARGETS = {
+        'shifts': ('Shifts', 'S', '_shift_row'),
+        'active_bonuses': ('ActiveBonuses', 'G', '_active_bonus_row'),
+        'employee_ranks': ('EmployeeRanks', 'G', '_employee_rank_row'),
+        'employees': ('EmployeeSettings', 'E', '_employee_row'),
+    }
+
+    def _shift_row(self, record_id: int):
+        """Build the Shifts sheet row for a shift from PostgreSQL.
 
         Args:
             record_id: Shift ID
-            operation: INSERT, UPDATE, or DELETE
-            data: Record data (JSONB from PostgreSQL)
-        """
-        try:
-            # Get Shifts worksheet
-            worksheet = self._sheets_api_call(self.spreadsheet.worksheet, 'Shifts')
-
-            if operation == 'DELETE':
-                # Find and delete row
-                cell = self._sheets_api_call(worksheet.find, str(record_id), in_column=1)
-                if cell:
-                    self._sheets_api_call(worksheet.delete_rows, cell.row)
-                    logger.info(f"Deleted shift {record_id} from Google Sheets")
-                return
-
-            # For INSERT/UPDATE, get the full shift data from PostgreSQL
-            with self.db_conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("""
-                    SELECT
-                        s.id,
-                        s.date,
-                        s.employee_id,
-                        s.employee_name,
-                        s.clock_in,
-                        s.clock_out,
-                        s.worked_hours,
-                        s.total_sales,
-                        s.net_sales,
-                        s.commission_pct,
-                        s.total_per_hour,
-                        s.commissions,
-                        s.total_made,
-                        s.rolling_average,
-                        s.bonus_counter,
-                        COALESCE((SELECT amount FROM shift_products WHERE shift_id = s.id AND product_id = 1), 0) as model_a,
-                        COALESCE((SELECT amount FROM shift_products WHERE shift_id = s.id AND product_id = 2), 0) as model_b,
-                        COALESCE((SELECT amount FROM shift_products WHERE shift_id = s.id AND product_id = 3), 0) as model_c,
-                        COALESCE((SELECT amount FROM shift_products WHERE shift_id = s.id AND product_id = 9), 0) as model_d
-                    FROM shifts s
-                    WHERE s.id = %s
-                """, (record_id,))
-                shift = cur.fetchone()
-
-            if not shift:
-                logger.warning(f"Shift {record_id} not found in database")
-                return
-
-            # Format row data for Google Sheets (19 columns, Models at the end)
-            # Columns: ID, Date, EmployeeID, EmployeeName, ClockIn, ClockOut, WorkedHours,
-            #          TotalSales, NetSales, CommissionPct, TotalHourly, Commissions, TotalMade,
-            #          RollingAverage, BonusCounter, ModelA, ModelB, ModelC, ModelD
-            row_data = [
-                shift['id'],                                                              # A: ID
-                shift['date'].strftime('%Y-%m-%d %H:%M:%S') if shift['date'] else '',     # B: Date
-                shift['employee_id'],                                                     # C: EmployeeID
-                shift['employee_name'],                                                   # D: EmployeeName
-                shift['clock_in'].strftime('%Y-%m-%d %H:%M:%S') if shift['clock_in'] else '',   # E: ClockIn
-                shift['clock_out'].strftime('%Y-%m-%d %H:%M:%S') if shift['clock_out'] else '', # F: ClockOut
-                float(shift['worked_hours']) if shift['worked_hours'] else 0,             # G: WorkedHours
-                float(shift['total_sales']) if shift['total_sales'] else 0,               # H: TotalSales
-                float(shift['net_sales']) if shift['net_sales'] else 0,                   # I: NetSales
-                float(shift['commission_pct']) if shift['commission_pct'] else 0,         # J: CommissionPct
-                float(shift['total_per_hour']) if shift['total_per_hour'] else 0,         # K: TotalHourly
-                float(shift['commissions']) if shift['commissions'] else 0,               # L: Commissions
-                float(shift['total_made']) if shift['total_made'] else 0,                 # M: TotalMade
-                float(shift['rolling_average']) if shift['rolling_average'] else 0,       # N: RollingAverage
-                'TRUE' if shift['bonus_counter'] else 'FALSE',                            # O: BonusCounter
-                float(shift['model_a']) if shift['model_a'] else 0,                       # P: ModelA
-                float(shift['model_b']) if shift['model_b'] else 0,                       # Q: ModelB
-                float(shift['model_c']) if shift['model_c'] else 0,                       # R: ModelC
-                float(shift['model_d']) if shift['model_d'] else 0,                       # S: ModelD
-            ]
-
-            # Check if row exists
-            try:
-                cell = self._sheets_api_call(worksheet.find, str(record_id), in_column=1)
-                if cell:
-                    # Update existing row (19 columns: A to S)
-                    self._sheets_api_call(worksheet.update, f'A{cell.row}:S{cell.row}', [row_data])
-                    logger.info(f"Updated shift {record_id} in Google Sheets")
-                else:
-                    # Append new row
-                    self._sheets_api_call(worksheet.append_row, row_data)
-                    logger.info(f"Inserted shift {record_id} to Google Sheets")
-            except gspread.exceptions.CellNotFound:
-                # Append new row
-                self._sheets_api_call(worksheet.append_row, row_data)
-                logger.info(f"Inserted shift {record_id} to Google Sheets")
 
-        except Exception as e:
-            logger.error(f"Failed to sync shift {record_id}: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
-            raise
-
-    def _sync_active_bonus(self, record_id: int, operation: str, data: dict):
-        """Sync an active bonus record to Google Sheets.
+        Returns:
+            Row values, or None if the shift no longer exists
+        """
+        # For INSERT/UPDATE, get the full shift data from PostgreSQL
+        with self.db_conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute("""
+                SELECT
+                    s.id,
+                    s.date,
+                    s.employee_id,
+                    s.employee_name,
+                    s.clock_in,
+                    s.clock_out,
+                    s.worked_hours,
+                    s.total_sales,
+                    s.net_sales,
+                    s.commission_pct,
+                    s.total_per_hour,
+                    s.commissions,
+                    s.total_made,
+                    s.rolling_average,
+                    s.bonus_counter,
+                    COALESCE((SELECT amount FROM shift_products WHERE shift_id = s.id AND product_id = 1), 0) as model_a,
+                    COALESCE((SELECT amount FROM shift_products WHERE shift_id = s.id AND product_id = 2), 0) as model_b,
+                    COALESCE((SELECT amount FROM shift_products WHERE shift_id = s.id AND product_id = 3), 0) as model_c,
+                    COALESCE((SELECT amount FROM shift_products WHERE shift_id = s.id AND product_id = 9), 0) as model_d
+                FROM shifts s
+                WHERE s.id = %s
+            """, (record_id,))
+            shift = cur.fetchone()
+
+        if not shift:
+            logger.warning(f"Shift {record_id} not found in database")
+            return None
+
+        # Format row data for Google Sheets (19 columns, Models at the end)
+        # Columns: ID, Date, EmployeeID, EmployeeName, ClockIn, ClockOut, WorkedHours,
+        #          TotalSales, NetSales, CommissionPct, TotalHourly, Commissions, TotalMade,
+        #          RollingAverage, BonusCounter, ModelA, ModelB, ModelC, ModelD
+        row_data = [
+            shift['id'],                                                              # A: ID
+            shift['date'].strftime('%Y-%m-%d %H:%M:%S') if shift['date'] else '',     # B: Date
+            shift['employee_id'],                                                     # C: EmployeeID
+            shift['employee_name'],                                                   # D: EmployeeName
+            shift['clock_in'].strftime('%Y-%m-%d %H:%M:%S') if shift['clock_in'] else '',   # E: ClockIn
+            shift['clock_out'].strftime('%Y-%m-%d %H:%M:%S') if shift['clock_out'] else '', # F: ClockOut
+            float(shift['worked_hours']) if shift['worked_hours'] else 0,             # G: WorkedHours
+            float(shift['total_sales']) if shift['total_sales'] else 0,               # H: TotalSales
+            float(shift['net_sales']) if shift['net_sales'] else 0,                   # I: NetSales
+            float(shift['commission_pct']) if shift['commission_pct'] else 0,         # J: CommissionPct
+            float(shift['total_per_hour']) if shift['total_per_hour'] else 0,         # K: TotalHourly
+            float(shift['commissions']) if shift['commissions'] else 0,               # L: Commissions
+            float(shift['total_made']) if shift['total_made'] else 0,                 # M: TotalMade
+            float(shift['rolling_average']) if shift['rolling_average'] else 0,       # N: RollingAverage
+            'TRUE' if shift['bonus_counter'] else 'FALSE',                            # O: BonusCounter
+            float(shift['model_a']) if shift['model_a'] else 0,                       # P: ModelA
+            float(shift['model_b']) if shift['model_b'] else 0,                       # Q: ModelB
+            float(shift['model_c']) if shift['model_c'] else 0,                       # R: ModelC
+            float(shift['model_d']) if shift['model_d'] else 0,                       # S: ModelD
+        ]
+
+        return row_data
+
+    def _active_bonus_row(self, record_id: int):
+        """Build the ActiveBonuses sheet row for a bonus from PostgreSQL.
 
         Args:
             record_id: Bonus ID
-            operation: INSERT, UPDATE, or DELETE
-            data: Record data (JSONB from PostgreSQL)
-        """
-        try:
-            worksheet = self._sheets_api_call(self.spreadsheet.worksheet, 'ActiveBonuses')
-
-            if operation == 'DELETE':
-                # Find and delete row
-                cell = self._sheets_api_call(worksheet.find, str(record_id), in_column=1)
-                if cell:
-                    self._sheets_api_call(worksheet.delete_rows, cell.row)
-                    logger.info(f"Deleted active bonus {record_id} from Google Sheets")
-                return
-
-            # For INSERT/UPDATE, get the full data from PostgreSQL
-            with self.db_conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("""
-                    SELECT id, employee_id, bonus_type, value, applied, shift_id, created_at
-                    FROM active_bonuses
-                    WHERE id = %s
-                """, (record_id,))
-                bonus = cur.fetchone()
-
-            if not bonus:
-                logger.warning(f"Active bonus {record_id} not found in database")
-                return
-
-            # Format row data
-            row_data = [
-                bonus['id'],
-                bonus['employee_id'],
-                bonus['bonus_type'],
-                float(bonus['value']) if bonus['value'] else 0,
-                'TRUE' if bonus['applied'] else 'FALSE',
-                bonus['shift_id'] if bonus['shift_id'] else '',
-                bonus['created_at'].strftime('%Y-%m-%d %H:%M:%S') if bonus['created_at'] else ''
-            ]
-
-            # Check if row exists
-            try:
-                cell = self._sheets_api_call(worksheet.find, str(record_id), in_column=1)
-                if cell:
-                    # Update existing row
-                    self._sheets_api_call(worksheet.update, f'A{cell.row}:G{cell.row}', [row_data])
-                    logger.info(f"Updated active bonus {record_id} in Google Sheets")
-                else:
-                    # Append new row
-                    self._sheets_api_call(worksheet.append_row, row_data)
-                    logger.info(f"Inserted active bonus {record_id} to Google Sheets")
-            except gspread.exceptions.CellNotFound:
-                # Append new row
-                self._sheets_api_call(worksheet.append_row, row_data)
-                logger.info(f"Inserted active bonus {record_id} to Google Sheets")
-
-        except Exception as e:
-            logger.error(f"Failed to sync active bonus {record_id}: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
-            raise
 
-    def _sync_employee_rank(self, record_id: int, operation: str, data: dict):
-        """Sync an employee rank record to Google Sheets.
+        Returns:
+            Row values, or None if the bonus no longer exists
+        """
+        # For INSERT/UPDATE, get the full data from PostgreSQL
+        with self.db_conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute("""
+                SELECT id, employee_id, bonus_type, value, applied, shift_id, created_at
+                FROM active_bonuses
+                WHERE id = %s
+            """, (record_id,))
+            bonus = cur.fetchone()
+
+        if not bonus:
+            logger.warning(f"Active bonus {record_id} not found in database")
+            return None
+
+        # Format row data
+        row_data = [
+            bonus['id'],
+            bonus['employee_id'],
+            bonus['bonus_type'],
+            float(bonus['value']) if bonus['value'] else 0,
+            'TRUE' if bonus['applied'] else 'FALSE',
+            bonus['shift_id'] if bonus['shift_id'] else '',
+            bonus['created_at'].strftime('%Y-%m-%d %H:%M:%S') if bonus['created_at'] else ''
+        ]
+
+        return row_data
+
+    def _employee_rank_row(self, record_id: int):
+        """Build the EmployeeRanks sheet row for an employee rank from PostgreSQL.
 
         Args:
             record_id: Employee rank ID
-            operation: INSERT, UPDATE, or DELETE
-            data: Record data (JSONB from PostgreSQL)
+
+        Returns:
+            Row values, or None if the record no longer exists
         """
-        try:
-            worksheet = self._sheets_api_call(self.spreadsheet.worksheet, 'EmployeeRanks')
+        # For INSERT/UPDATE, get the full data from PostgreSQL
+        with self.db_conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute("""
+                SELECT
+                    er.employee_id,
+                    er.year,
+                    er.month,
+                    r_current.name as current_rank,
+                    r_prev.name as previous_rank,
+                    er.updated_at,
+                    er.notified
+                FROM employee_ranks er
+                LEFT JOIN ranks r_current ON er.current_rank_id = r_current.id
+                LEFT JOIN ranks r_prev ON er.previous_rank_id = r_prev.id
+                WHERE er.id = %s
+            """, (record_id,))
+            rank = cur.fetchone()
+
+        if not rank:
+            logger.warning(f"Employee rank {record_id} not found in database")
+            return None
+
+        # Format row data
+        row_data = [
+            rank['employee_id'],
+            rank['year'],
+            rank['month'],
+            rank['current_rank'] if rank['current_rank'] else '',
+            rank['previous_rank'] if rank['previous_rank'] else '',
+            rank['updated_at'].strftime('%Y-%m-%d %H:%M:%S') if rank['updated_at'] else '',
+            'TRUE' if rank['notified'] else 'FALSE'
+        ]
+
+        return row_data
+
+    def _employee_row(self, record_id: int):
+        """Build the EmployeeSettings sheet row for an employee from PostgreSQL.
 
-            if operation == 'DELETE':
-                # Find and delete row
-                cell = self._sheets_api_call(worksheet.find, str(record_id), in_column=1)
-                if cell:
-                    self._sheets_api_call(worksheet.delete_rows, cell.row)
-                    logger.info(f"Deleted employee rank {record_id} from Google Sheets")
-                return
+        Args:
+            record_id: Employee ID
 
-            # For INSERT/UPDATE, get the full data from PostgreSQL
-            with self.db_conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("""
-                    SELECT
-                        er.employee_id,
-                        er.year,
-                        er.month,
-                        r_current.name as current_rank,
-                        r_prev.name as previous_rank,
-                        er.updated_at,
-                        er.notified
-                    FROM employee_ranks er
-                    LEFT JOIN ranks r_current ON er.current_rank_id = r_current.id
-                    LEFT JOIN ranks r_prev ON er.previous_rank_id = r_prev.id
-                    WHERE er.id = %s
-                """, (record_id,))
-                rank = cur.fetchone()
-
-            if not rank:
-                logger.warning(f"Employee rank {record_id} not found in database")
-                return
-
-            # Format row data
-            row_data = [
-                rank['employee_id'],
-                rank['year'],
-                rank['month'],
-                rank['current_rank'] if rank['current_rank'] else '',
-                rank['previous_rank'] if rank['previous_rank'] else '',
-                rank['updated_at'].strftime('%Y-%m-%d %H:%M:%S') if rank['updated_at'] else '',
-                'TRUE' if rank['notified'] else 'FALSE'
-            ]
-
-            # Find by employee_id, year, month (composite key)
-            all_values = self._sheets_api_call(worksheet.get_all_values)
-            found_row = None
-            for idx, row in enumerate(all_values[1:], start=2):  # Skip header
-                if (len(row) >= 3 and
-                    str(row[0]) == str(rank['employee_id']) and
-                    str(row[1]) == str(rank['year']) and
-                    str(row[2]) == str(rank['month'])):
-                    found_row = idx
-                    break
+        Returns:
+            Row values, or None if the employee no longer exists
+        """
+        # For INSERT/UPDATE, get the full data from PostgreSQL
+        with self.db_conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute("""
+                SELECT id, name, telegram_id, is_active, hourly_wage, sales_commission
+                FROM employees
+                WHERE id = %s
+            """, (record_id,))
+            employee = cur.fetchone()
+
+        if not employee:
+            logger.warning(f"Employee {record_id} not found in database")
+            return None
+
+        # Format row data for EmployeeSettings worksheet
+        # Columns: EmployeeID, EmployeeName, Hourly wage, Sales commission, Active
+        row_data = [
+            employee['id'],
+            employee['name'],
+            float(employee['hourly_wage']) if employee['hourly_wage'] else 15.0,
+            float(employee['sales_commission']) if employee['sales_commission'] else 8.0,
+            'TRUE' if employee['is_active'] else 'FALSE'
+        ]
+
+        return row_data
+
+    def _sync_table_batch(self, table_name: str, records: list) -> list:
+        """Sync all pending records of one table with a fixed number of API calls.
+
+        The worksheet is read once; changed rows are written with one
+        batch_update, new rows with one append_rows and deletions with one
+        spreadsheet batch_update, instead of find/update/append per record.
+
+        Each record gets its own outcome: a record whose row can't be built
+        is failed on its own, and the records carried by an API call are
+        completed as soon as that call returns. Records of a call that
+        raised get no result, so they stay pending and are retried.
 
-            if found_row:
-                # Update existing row
-                self._sheets_api_call(worksheet.update, f'A{found_row}:G{found_row}', [row_data])
-                logger.info(f"Updated employee rank {record_id} in Google Sheets")
-            else:
-                # Append new row
-                self._sheets_api_call(worksheet.append_row, row_data)
-                logger.info(f"Inserted employee rank {record_id} to Google Sheets")
+        Args:
+            table_name: PostgreSQL table name (key of SYNC_TARGETS)
+            records: sync_queue records of this table, in queue order
 
-        except Exception as e:
-            logger.error(f"Failed to sync employee rank {record_id}: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
-            raise
+        Returns:
+            List of (sync queue record ID, status, error message or None)
+        """
+        title, last_col, row_builder = self.SYNC_TARGETS[table_name]
+        build_row = getattr(self, row_builder)
+
+        worksheet = self._sheets_api_call(self.spreadsheet.worksheet, title)
+        all_values = self._sheets_api_call(worksheet.get_all_values)
+
+        # First sheet row per ID in column A, and per (A, B, C) for EmployeeRanks
+        row_by_id = {}
+        row_by_rank_key = {}
+        for idx, row in enumerate(all_values[1:], start=2):  # Skip header
+            if row:
+                row_by_id.setdefault(str(row[0]), idx)
+            if len(row) >= 3:
+                row_by_rank_key.setdefault((str(row[0]), str(row[1]), str(row[2])), idx)
+
+        results = []
+        updates = {}      # sheet row -> values
+        appends = {}      # record key -> values
+        delete_rows = set()
+        # Sync record IDs whose change is carried by each pending write:
+        # ('update', row), ('append', key) or ('delete', row) -> [sync id, ...]
+        owners = {}
+
+        for sync_record in records:
+            sync_id = sync_record['id']
+            record_id = sync_record['record_id']
+
+            if sync_record['operation'] == 'DELETE':
+                # Earlier changes of this record are superseded by the delete
+                superseded = owners.pop(('append', str(record_id)), [])
+                appends.pop(str(record_id), None)
+                row = row_by_id.get(str(record_id))
+                if row:
+                    delete_rows.add(row)
+                    updates.pop(row, None)
+                    superseded += owners.pop(('update', row), [])
+                    owners.setdefault(('delete', row), []).extend(superseded + [sync_id])
+                else:
+                    # Not on the sheet: nothing to write
+                    results.extend((i, 'completed', None) for i in superseded + [sync_id])
+                continue
 
-    def _sync_employee(self, record_id: int, operation: str, data: dict):
-        """Sync an employee record to Google Sheets EmployeeSettings.
+            # A failing row query must not abort the transaction holding the queue locks
+            with self.db_conn.cursor() as cur:
+                cur.execute("SAVEPOINT build_row")
+            try:
+                row_data = build_row(record_id)
+            except Exception as e:
+                with self.db_conn.cursor() as cur:
+                    cur.execute("ROLLBACK TO SAVEPOINT build_row")
+                logger.error(f"Failed to build {table_name} row for record {record_id}: {e}")
+                results.append((sync_id, 'failed', str(e)))
+                continue
+
+            if row_data is None:
+                # Record no longer exists: nothing to write
+                results.append((sync_id, 'completed', None))
+                continue
+
+            if table_name == 'employee_ranks':
+                # Find by employee_id, year, month (composite key)
+                key = (str(row_data[0]), str(row_data[1]), str(row_data[2]))
+                row = row_by_rank_key.get(key)
+            else:
+                key = str(record_id)
+                row = row_by_id.get(key)
 
-        Args:
-            record_id: Employee ID
-            operation: INSERT, UPDATE, or DELETE
-            data: Record data (JSONB from PostgreSQL)
-        """
-        try:
-            worksheet = self._sheets_api_call(self.spreadsheet.worksheet, 'EmployeeSettings')
+            if row and row not in delete_rows:
+                updates[row] = row_data
+                owners.setdefault(('update', row), []).append(sync_id)
+            else:
+                appends[key] = row_data
+                owners.setdefault(('append', key), []).append(sync_id)
 
-            if operation == 'DELETE':
-                # Find and delete row by employee ID
-                cell = self._sheets_api_call(worksheet.find, str(record_id), in_column=1)
-                if cell:
-                    self._sheets_api_call(worksheet.delete_rows, cell.row)
-                    logger.info(f"Deleted employee {record_id} from Google Sheets")
-                return
+        def completed(kind, keys):
+            for key in keys:
+                results.extend((i, 'completed', None) for i in owners.get((kind, key), []))
 
-            # For INSERT/UPDATE, get the full data from PostgreSQL
-            with self.db_conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("""
-                    SELECT id, name, telegram_id, is_active, hourly_wage, sales_commission
-                    FROM employees
-                    WHERE id = %s
-                """, (record_id,))
-                employee = cur.fetchone()
-
-            if not employee:
-                logger.warning(f"Employee {record_id} not found in database")
-                return
-
-            # Format row data for EmployeeSettings worksheet
-            # Columns: EmployeeID, EmployeeName, Hourly wage, Sales commission, Active
-            row_data = [
-                employee['id'],
-                employee['name'],
-                float(employee['hourly_wage']) if employee['hourly_wage'] else 15.0,
-                float(employee['sales_commission']) if employee['sales_commission'] else 8.0,
-                'TRUE' if employee['is_active'] else 'FALSE'
-            ]
-
-            # Check if row exists
+        if updates:
             try:
-                cell = self._sheets_api_call(worksheet.find, str(record_id), in_column=1)
-                if cell:
-                    # Update existing row
-                    self._sheets_api_call(worksheet.update, f'A{cell.row}:E{cell.row}', [row_data])
-                    logger.info(f"Updated employee {record_id} in Google Sheets")
-                else:
-                    # Append new row
-                    self._sheets_api_call(worksheet.append_row, row_data)
-                    logger.info(f"Inserted employee {record_id} to Google Sheets")
-            except gspread.exceptions.CellNotFound:
-                # Append new row
-                self._sheets_api_call(worksheet.append_row, row_data)
-                logger.info(f"Inserted employee {record_id} to Google Sheets")
-
-        except Exception as e:
-            logger.error(f"Failed to sync employee {record_id}: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
-            raise
+                self._sheets_api_call(worksheet.batch_update, [
+                    {'range': f'A{row}:{last_col}{row}', 'values': [row_data]}
+                    for row, row_data in updates.items()
+                ])
+                completed('update', updates)
+            except Exception as e:
+                logger.error(f"Failed to update {title} rows, left pending: {e}")
+        if appends:
+            try:
+                self._sheets_api_call(worksheet.append_rows, list(appends.values()))
+                completed('append', appends)
+            except Exception as e:
+                logger.error(f"Failed to append {title} rows, left pending: {e}")
+        if delete_rows:
+            try:
+                # Bottom-up so earlier deletions don't shift later row indexes
+                self._sheets_api_call(self.spreadsheet.batch_update, {'requests': [
+                    {
+                        'deleteDimension': {
+                            'range': {
+                                'sheetId': worksheet.id,
+                                'dimension': 'ROWS',
+                                'startIndex': row - 1,
+                                'endIndex': row,
+                            }
+                        }
+                    }
+                    for row in sorted(delete_rows, reverse=True)
+                ]})
+                completed('delete', delete_rows)
+            except Exception as e:
+                logger.error(f"Failed to delete {title} rows, left pending: {e}")
 
-    def _mark_synced(self, sync_id: int):
-        """Mark a sync record as synced.
+        logger.info(
+            f"Synced {title}: {len(updates)} updated, {len(appends)} inserted, "
+            f"{len(delete_rows)} deleted"
+        )
 
-        Args:
-            sync_id: Sync queue record ID
-        """
-        try:
-            with self.db_conn.cursor() as cur:
-                cur.execute("""
-                    UPDATE sync_queue
-                    SET status = 'completed', processed_at = NOW()
-                    WHERE id = %s
-                """, (sync_id,))
-            self.db_conn.commit()
+        return results
 
-        except Exception as e:
-            logger.error(f"Failed to mark sync {sync_id} as synced: {e}")
-            self.db_conn.rollback()
+    def _mark_results(self, results: list):
+        """Write the outcome of sync records in one statement and commit.
 
-    def _mark_failed(self, sync_id: int, error_message: str):
-        """Mark a sync record as failed.
+        Always ends the transaction opened by _get_pending_syncs(), releasing
+        its row locks, even when there is nothing to mark.
 
         Args:
-            sync_id: Sync queue record ID
-            error_message: Error message
+            results: List of (sync queue record ID, status, error message or None)
+                tuples, status being 'completed' or 'failed'
         """
         try:
-            with self.db_conn.cursor() as cur:
-                cur.execute("""
-                    UPDATE sync_queue
-                    SET status = 'failed',
-                        error_message = %s,
-                        processed_at = NOW()
-                    WHERE id = %s
-                """, (error_message[:500], sync_id))  # Limit error message length
+            if results:
+                with self.db_conn.cursor() as cur:
+                    execute_values(cur, """
+                        UPDATE sync_queue
+                        SET status = data.status,
+                            error_message = data.error,
+                            processed_at = NOW()
+                        FROM (VALUES %s) AS data(id, status, error)
+                        WHERE sync_queue.id = data.id
+                    """, [
+                        (sync_id, status, error_message[:500] if error_message else None)  # Limit error message length
+                        for sync_id, status, error_message in results
+                    ], template="(%s, %s, %s)")
             self.db_conn.commit()
 
         except Exception as e:
-            logger.error(f"Failed to mark sync {sync_id} as failed: {e}")
+            logger.error(f"Failed to mark {len(results)} sync results: {e}")
             self.db_conn.rollback()
 
     def _perform_sync(self) -> bool:
@@ -634,44 +649,48 @@ class PostgresSyncWorker:
 
             if not pending_syncs:
                 logger.info("No pending syncs, skipping")
+                if self.db_conn is not None and not self.db_conn.closed:
+                    self._mark_results([])  # End the (empty) locking transaction
                 self.sync_count += 1
                 self.last_sync_time = datetime.now()
                 return True
 
             # Process each sync
+            results = []
             synced_count = 0
             failed_count = 0
 
+            # Group by table, keeping queue order within each table
+            by_table = {}
             for sync_record in pending_syncs:
+                by_table.setdefault(sync_record['table_name'], []).append(sync_record)
+
+            for table_name, records in by_table.items():
+                if table_name not in self.SYNC_TARGETS:
+                    logger.warning(f"Unknown table: {table_name}")
+                    results.extend(
+                        (sync_record['id'], 'failed', f"Unknown table: {table_name}")
+                        for sync_record in records
+                    )
+                    failed_count += len(records)
+                    continue
+
                 try:
-                    table_name = sync_record['table_name']
-                    record_id = sync_record['record_id']
-                    operation = sync_record['operation']
-                    data = sync_record['data']
-
-                    logger.info(f"Syncing {table_name} {record_id} ({operation})")
-
-                    # Route to appropriate sync method
-                    if table_name == 'shifts':
-                        self._sync_shift(record_id, operation, data)
-                    elif table_name == 'active_bonuses':
-                        self._sync_active_bonus(record_id, operation, data)
-                    elif table_name == 'employee_ranks':
-                        self._sync_employee_rank(record_id, operation, data)
-                    elif table_name == 'employees':
-                        self._sync_employee(record_id, operation, data)
-                    else:
-                        logger.warning(f"Unknown table: {table_name}")
-                        continue
+                    logger.info(f"Syncing {len(records)} {table_name} records")
+                    table_results = self._sync_table_batch(table_name, records)
+                except Exception as e:
+                    # Worksheet could not be read: leave the records pending for retry
+                    logger.error(f"Failed to sync {table_name} batch, left pending: {e}")
+                    import traceback
+                    logger.error(traceback.format_exc())
+                    continue
 
-                    # Mark as synced
-                    self._mark_synced(sync_record['id'])
-                    synced_count += 1
+                results.extend(table_results)
+                synced_count += sum(1 for _, status, _ in table_results if status == 'completed')
+                failed_count += sum(1 for _, status, _ in table_results if status == 'failed')
 
-                except Exception as e:
-                    logger.error(f"Failed to sync record {sync_record['id']}: {e}")
-                    self._mark_failed(sync_record['id'], str(e))
-                    failed_count += 1
+            # Mark results in one statement; the commit releases the row locks
+            self._mark_results(results)
 
             # Calculate duration
             duration = time.time() - start_time
@@ -683,7 +702,10 @@ class PostgresSyncWorker:
 
             logger.info("=" * 70)
             logger.info(f"Sync cycle #{self.sync_count} completed in {duration:.2f}s")
-            logger.info(f"Synced: {synced_count}, Failed: {failed_count}")
+            logger.info(
+                f"Synced: {synced_count}, Failed: {failed_count}, "
+                f"Left pending: {len(pending_syncs) - synced_count - failed_count}"
+            )
             logger.info("=" * 70)
 
             return True
@@ -692,6 +714,12 @@ class PostgresSyncWorker:
             logger.error(f"Sync cycle failed: {e}")
             self.error_count += 1
 
+            # Release row locks taken by _get_pending_syncs()
+            try:
+                self.db_conn.rollback()
+            except Exception:
+                pass
+
             # Log traceback for debugging
             import traceback
             logger.error(traceback.format_exc())
@@ -0,0 +1,67 @@
+"""Shared helpers for dev scripts."""
+
+import logging
+import random
+import sys
+import time
+from functools import lru_cache
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+import gspread
+from gspread.exceptions import APIError
+from services.sheets_client import get_sheets_client
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth retrying: quota exceeded and transient server errors
+RETRIABLE_STATUSES = frozenset({429, 500, 502, 503})
+
+
+def get_client() -> gspread.Client:
+    """Get the process-wide authorized gspread client.
+
+    Returns:
+        Authorized gspread client.
+    """
+    return get_sheets_client()
+
+
+@lru_cache(maxsize=1)
+def get_sheets():
+    """Get SheetsService built on the shared client, created once per process.
+
+    Returns:
+        SheetsService instance.
+    """
+    from sheets_service import SheetsService
+
+    return SheetsService(client=get_client())
+
+
+
+def sheets_call(func, *args, max_retries: int = 5, **kwargs):
+    """Execute Google Sheets API call with exponential backoff on transient errors.
+
+    Args:
+        func: The API function to call
+        *args, **kwargs: Arguments to pass to the function
+        max_retries: Retries after the first attempt
+
+    Returns:
+        Result of the API call
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return func(*args, **kwargs)
+        except APIError as e:
+            if e.response.status_code not in RETRIABLE_STATUSES or attempt == max_retries:
+                raise
+            delay = min(60.0, 2 ** attempt) + random.uniform(0, 1)
+            logger.warning(
+                f"Sheets API error {e.response.status_code} "
+                f"(attempt {attempt + 1}/{max_retries + 1}), retrying in {delay:.1f}s..."
+            )
+            time.sleep(delay)
@@ -6,9 +6,9 @@ from pathlib import Path
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
-import gspread
 from config import Config
-from datetime import datetime
+from sheets_service import SheetsService
+from _shared import get_client
 
 def add_test_data():
     """Add test shifts to demonstrate percent_prev logic."""
@@ -16,9 +16,8 @@ def add_test_data():
     print("ADDING TEST DATA FOR PERCENT_PREV TESTING")
     print("="*60)
 
-    client = gspread.service_account(filename=Config.GOOGLE_SA_JSON)
-    spreadsheet = client.open_by_key(Config.SPREADSHEET_ID)
-    ws = spreadsheet.worksheet("Shifts")
+    sheets = SheetsService(client=get_client())
+    ws = sheets.get_worksheet()
 
     # Get next ID
     all_values = ws.get_all_values()
@@ -113,7 +112,7 @@ def add_test_data():
     ]
 
     # Get headers
-    headers = ws.row_values(1)
+    headers = sheets.shift_headers
 
     print("\nAdding test shifts:")
     print("="*60)
@@ -9,6 +9,7 @@ sys.path.insert(0, str(project_root))
 
 import logging
 from sheets_service import SheetsService
+from _shared import get_client
 
 logging.basicConfig(
     level=logging.INFO,
@@ -20,7 +21,7 @@ logger = logging.getLogger(__name__)
 def check_shark_rank():
     """Check Shark rank bonuses in Google Sheets."""
     try:
-        sheets = SheetsService()
+        sheets = SheetsService(client=get_client())
         ranks = sheets.get_ranks()
 
         print("\n" + "="*60)
@@ -8,6 +8,7 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 import logging
 from sheets_service import SheetsService
+from _shared import get_client
 from config import Config
 
 logging.basicConfig(level=logging.INFO)
@@ -18,7 +19,7 @@ def main():
     """Check and initialize Google Sheets."""
     try:
         logger.info("Initializing Google Sheets service...")
-        sheets = SheetsService()
+        sheets = SheetsService(client=get_client())
 
         logger.info(f"Spreadsheet ID: {Config.SPREADSHEET_ID}")
         logger.info(f"Sheet name: {Config.SHEET_NAME}")
@@ -33,7 +34,7 @@ def main():
         sheets.ensure_headers(ws)
 
         # Read and display headers
-        headers = ws.row_values(1)
+        headers = sheets.shift_headers
         logger.info(f"\n✅ Headers set successfully:")
         for i, header in enumerate(headers, 1):
             logger.info(f"   {i}. {header}")
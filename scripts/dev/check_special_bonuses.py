@@ -9,6 +9,7 @@ sys.path.insert(0, str(project_root))
 
 import logging
 from sheets_service import SheetsService
+from _shared import get_client
 from rank_service import RankService
 
 logging.basicConfig(
@@ -21,7 +22,7 @@ logger = logging.getLogger(__name__)
 def check_special_bonuses():
     """Check special bonuses for Shark and King of Greed ranks."""
     try:
-        sheets = SheetsService()
+        sheets = SheetsService(client=get_client())
         rank_service = RankService(sheets)
         ranks = sheets.get_ranks()
 
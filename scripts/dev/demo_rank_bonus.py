@@ -10,6 +10,7 @@ import logging
 from decimal import Decimal
 
 from sheets_service import SheetsService
+from _shared import get_client
 from rank_service import RankService
 from time_utils import format_dt, now_et
 
@@ -23,7 +24,7 @@ def demo_rank_bonus():
     print("DEMO: RANK BONUS SYSTEM")
     print("="*60)
 
-    sheets = SheetsService()
+    sheets = SheetsService(client=get_client())
     rank_service = RankService(sheets)
 
     # Test employee
@@ -123,14 +124,12 @@ def demo_rank_bonus():
     print("ACTIVE BONUSES TABLE")
     print("="*60)
 
-    import gspread
-    from config import Config
-
-    client = gspread.service_account(filename=Config.GOOGLE_SA_JSON)
-    spreadsheet = client.open_by_key(Config.SPREADSHEET_ID)
-    ws = spreadsheet.worksheet("ActiveBonuses")
-
-    data = ws.get_all_values()
+    # Read both tables in a single values.batchGet request
+    resp = sheets.spreadsheet.values_batch_get(
+        ranges=["ActiveBonuses!A:Z", "EmployeeRanks!A:Z"]
+    )
+    bonuses_range, ranks_range = resp["valueRanges"]
+    data = bonuses_range.get("values", [])
 
     for i, row in enumerate(data):
         if i == 0:
@@ -138,7 +137,7 @@ def demo_rank_bonus():
             print(" | ".join(row))
             print("-" * 80)
         else:
-            if row[0]:  # If ID exists
+            if row and row[0]:  # If ID exists
                 print(" | ".join(row))
 
     # Step 4: Show EmployeeRanks for test user
@@ -146,8 +145,9 @@ def demo_rank_bonus():
     print("EMPLOYEE RANKS (Test User)")
     print("="*60)
 
-    ws = spreadsheet.worksheet("EmployeeRanks")
-    all_records = ws.get_all_records()
+    rank_rows = ranks_range.get("values", [])
+    rank_headers = rank_rows[0] if rank_rows else []
+    all_records = [dict(zip(rank_headers, row)) for row in rank_rows[1:]]
 
     for record in all_records:
         if str(record.get("EmployeeId")) == str(test_employee_id):
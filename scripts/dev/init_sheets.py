@@ -7,9 +7,11 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 import logging
-from typing import List
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple
 import gspread
 from config import Config
+from _shared import get_client, sheets_call
 
 logging.basicConfig(
     level=logging.INFO,
@@ -17,6 +19,86 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Expected Shifts structure:
+# ID, Date, EmployeeId, EmployeeName, Clock in, Clock out,
+# Worked hours/shift, Model A, Model B, Model C, ...,
+# Total sales, Net sales, %, Total per hour, Commissions, Total made
+_EXPECTED_SHIFTS_HEADERS = (
+    ("ID", "Date", "EmployeeId", "EmployeeName", "Clock in", "Clock out", "Worked hours/shift")
+    + tuple(Config.PRODUCTS)
+    + ("Total sales", "Net sales", "%", "Total per hour", "Commissions", "Total made")
+)
+
+
+@dataclass(frozen=True)
+class SheetSpec:
+    """Sheet managed by the initializer."""
+
+    title: str
+    headers: Tuple[str, ...]
+    # Rows added only when the sheet has no data below the header
+    seed_rows: Tuple[Tuple[str, ...], ...] = ()
+    # Grid size used when the sheet has to be created
+    rows: int = 100
+    cols: int = 20
+
+
+INIT_SPECS: Tuple[SheetSpec, ...] = (
+    # Employee hourly wage and base commission
+    SheetSpec(
+        "EmployeeSettings",
+        ("EmployeeId", "Hourly wage", "Sales commission"),
+        (
+            ("120962578", "15.00", "8.0"),
+            ("123456789", "18.00", "10.0"),
+        ),
+        rows=100,
+        cols=10,
+    ),
+    # Dynamic commission rates based on daily sales
+    SheetSpec(
+        "DynamicRates",
+        ("Min Amount", "Max Amount", "Percentage"),
+        (
+            ("0", "499.99", "0.0"),
+            ("500", "999.99", "2.0"),
+            ("1000", "1999.99", "4.0"),
+            ("2000", "999999", "6.0"),
+        ),
+        rows=50,
+        cols=5,
+    ),
+    # Rank system configuration
+    SheetSpec(
+        "Ranks",
+        ("Rank Name", "Min Amount", "Max Amount", "Emoji", "Bonus 1", "Bonus 2", "Bonus 3", "TEXT"),
+        (
+            ("Rookie", "0", "1999.99", "🧑‍🚀", "none", "none", "none", "Keep pushing!"),
+            ("Hustler", "2000", "3999.99", "💪", "flat_10", "percent_next_1", "percent_prev_1", "You're really killing it!"),
+            ("Closer", "4000", "6999.99", "💼", "flat_25", "percent_next_2", "flat_15", "You're really killing it!"),
+            ("Shark", "7000", "9999.99", "🦈", "flat_50", "paid_day_off", "percent_next_3", "You're really killing it!"),
+            ("King of Greed", "10000", "14999.99", "💀", "flat_100", "percent_all_2", "telegram_premium", "You're really killing it!"),
+            ("Chatting God", "15000", "999999", "🔥", "flat_200", "double_commission", "flat_125", "You're really killing it!"),
+        ),
+        rows=50,
+        cols=10,
+    ),
+    # Current employee ranks
+    SheetSpec(
+        "EmployeeRanks",
+        ("EmployeeId", "Current Rank", "Previous Rank", "Month", "Year", "Notified", "Last Updated"),
+        rows=200,
+        cols=10,
+    ),
+    # Active bonuses to be applied
+    SheetSpec(
+        "ActiveBonuses",
+        ("ID", "EmployeeId", "Bonus Type", "Value", "Applied", "Shift ID", "Created At"),
+        rows=500,
+        cols=10,
+    ),
+)
+
 
 class SheetsInitializer:
     """Initialize new sheets for rank and bonus system."""
@@ -24,146 +106,64 @@ class SheetsInitializer:
     def __init__(self):
         """Initialize Google Sheets client."""
         try:
-            self.client = gspread.service_account(filename=Config.GOOGLE_SA_JSON)
-            self.spreadsheet = self.client.open_by_key(Config.SPREADSHEET_ID)
+            self.client = get_client()
+            self.spreadsheet = sheets_call(self.client.open_by_key, Config.SPREADSHEET_ID)
             logger.info("Connected to Google Sheets")
+            # One metadata fetch for all worksheets instead of one per worksheet() lookup
+            self._ws_by_title = {ws.title: ws for ws in sheets_call(self.spreadsheet.worksheets)}
+            # (worksheet, headers, seed rows) queued by init_sheets() and written by apply_pending()
+            self._pending: List[Tuple[gspread.Worksheet, Sequence[str], Sequence[Sequence[str]]]] = []
         except Exception as e:
             logger.error(f"Failed to connect to Google Sheets: {e}")
             raise
 
-    def get_or_create_worksheet(self, title: str, rows: int = 100, cols: int = 20) -> gspread.Worksheet:
-        """Get existing worksheet or create new one.
-
-        Args:
-            title: Worksheet title
-            rows: Number of rows
-            cols: Number of columns
-
-        Returns:
-            Worksheet object
-        """
-        try:
-            ws = self.spreadsheet.worksheet(title)
-            logger.info(f"Worksheet '{title}' already exists")
-            return ws
-        except gspread.WorksheetNotFound:
-            logger.info(f"Creating worksheet '{title}'...")
-            ws = self.spreadsheet.add_worksheet(title=title, rows=rows, cols=cols)
-            logger.info(f"Worksheet '{title}' created")
-            return ws
-
-    def init_employee_settings(self) -> None:
-        """Initialize EmployeeSettings sheet.
-
-        Structure:
-        | EmployeeId | Hourly wage | Sales commission |
-        """
-        ws = self.get_or_create_worksheet("EmployeeSettings", rows=100, cols=10)
-
-        headers = ["EmployeeId", "Hourly wage", "Sales commission"]
-
-        # Check if headers exist
-        existing_headers = ws.row_values(1)
-        if existing_headers != headers:
-            ws.update("A1", [headers], value_input_option="RAW")
-            logger.info("EmployeeSettings headers set")
-
-        # Add example data if empty
-        if len(ws.get_all_values()) == 1:
-            example_data = [
-                ["120962578", "15.00", "8.0"],
-                ["123456789", "18.00", "10.0"],
-            ]
-            ws.append_rows(example_data, value_input_option="RAW")
-            logger.info("EmployeeSettings example data added")
-
-    def init_dynamic_rates(self) -> None:
-        """Initialize DynamicRates sheet.
-
-        Structure:
-        | Min Amount | Max Amount | Percentage |
-        """
-        ws = self.get_or_create_worksheet("DynamicRates", rows=50, cols=5)
-
-        headers = ["Min Amount", "Max Amount", "Percentage"]
-
-        # Check if headers exist
-        existing_headers = ws.row_values(1)
-        if existing_headers != headers:
-            ws.update("A1", [headers], value_input_option="RAW")
-            logger.info("DynamicRates headers set")
-
-        # Add default rates if empty
-        if len(ws.get_all_values()) == 1:
-            default_rates = [
-                ["0", "499.99", "0.0"],
-                ["500", "999.99", "2.0"],
-                ["1000", "1999.99", "4.0"],
-                ["2000", "999999", "6.0"],
-            ]
-            ws.append_rows(default_rates, value_input_option="RAW")
-            logger.info("DynamicRates default data added")
+    def create_missing_worksheets(self, specs: Sequence[SheetSpec]) -> None:
+        """Create every worksheet from specs that does not exist yet.
 
-    def init_ranks(self) -> None:
-        """Initialize Ranks sheet.
+        All missing sheets are added with one spreadsheets.batchUpdate.
 
-        Structure:
-        | Rank Name | Min Amount | Max Amount | Emoji | Bonus 1 | Bonus 2 | Bonus 3 | TEXT |
+        Args:
+            specs: Sheet specs to check
         """
-        ws = self.get_or_create_worksheet("Ranks", rows=50, cols=10)
-
-        headers = ["Rank Name", "Min Amount", "Max Amount", "Emoji", "Bonus 1", "Bonus 2", "Bonus 3", "TEXT"]
-
-        # Check if headers exist
-        existing_headers = ws.row_values(1)
-        if existing_headers != headers:
-            ws.update("A1", [headers], value_input_option="RAW")
-            logger.info("Ranks headers set")
-
-        # Add rank data if empty
-        if len(ws.get_all_values()) == 1:
-            ranks_data = [
-                ["Rookie", "0", "1999.99", "🧑‍🚀", "none", "none", "none", "Keep pushing!"],
-                ["Hustler", "2000", "3999.99", "💪", "flat_10", "percent_next_1", "percent_prev_1", "You're really killing it!"],
-                ["Closer", "4000", "6999.99", "💼", "flat_25", "percent_next_2", "flat_15", "You're really killing it!"],
-                ["Shark", "7000", "9999.99", "🦈", "flat_50", "paid_day_off", "percent_next_3", "You're really killing it!"],
-                ["King of Greed", "10000", "14999.99", "💀", "flat_100", "percent_all_2", "telegram_premium", "You're really killing it!"],
-                ["Chatting God", "15000", "999999", "🔥", "flat_200", "double_commission", "flat_125", "You're really killing it!"],
+        missing = []
+        for spec in specs:
+            if spec.title in self._ws_by_title:
+                logger.info(f"Worksheet '{spec.title}' already exists")
+            else:
+                missing.append(spec)
+
+        if not missing:
+            return
+
+        logger.info(f"Creating worksheets: {', '.join(spec.title for spec in missing)}...")
+        sheets_call(self.spreadsheet.batch_update, {
+            "requests": [
+                {
+                    "addSheet": {
+                        "properties": {
+                            "title": spec.title,
+                            "gridProperties": {"rowCount": spec.rows, "columnCount": spec.cols},
+                        }
+                    }
+                }
+                for spec in missing
             ]
-            ws.append_rows(ranks_data, value_input_option="RAW")
-            logger.info("Ranks data added")
-
-    def init_employee_ranks(self) -> None:
-        """Initialize EmployeeRanks sheet.
-
-        Structure:
-        | EmployeeId | Current Rank | Previous Rank | Month | Year | Notified | Last Updated |
-        """
-        ws = self.get_or_create_worksheet("EmployeeRanks", rows=200, cols=10)
+        })
+        self._ws_by_title = {ws.title: ws for ws in sheets_call(self.spreadsheet.worksheets)}
+        logger.info("Worksheets created")
 
-        headers = ["EmployeeId", "Current Rank", "Previous Rank", "Month", "Year", "Notified", "Last Updated"]
+    def init_sheets(self, specs: Sequence[SheetSpec] = INIT_SPECS) -> None:
+        """Create missing sheets and queue their headers and seed rows.
 
-        # Check if headers exist
-        existing_headers = ws.row_values(1)
-        if existing_headers != headers:
-            ws.update("A1", [headers], value_input_option="RAW")
-            logger.info("EmployeeRanks headers set")
+        Headers are written if they differ and seed rows only if the sheet is
+        empty; both are checked and applied together in apply_pending().
 
-    def init_active_bonuses(self) -> None:
-        """Initialize ActiveBonuses sheet.
-
-        Structure:
-        | ID | EmployeeId | Bonus Type | Value | Applied | Shift ID | Created At |
+        Args:
+            specs: Sheet specs to initialize
         """
-        ws = self.get_or_create_worksheet("ActiveBonuses", rows=500, cols=10)
-
-        headers = ["ID", "EmployeeId", "Bonus Type", "Value", "Applied", "Shift ID", "Created At"]
-
-        # Check if headers exist
-        existing_headers = ws.row_values(1)
-        if existing_headers != headers:
-            ws.update("A1", [headers], value_input_option="RAW")
-            logger.info("ActiveBonuses headers set")
+        self.create_missing_worksheets(specs)
+        for spec in specs:
+            self._pending.append((self._ws_by_title[spec.title], spec.headers, spec.seed_rows))
 
     def update_shifts_headers(self) -> None:
         """Update Shifts sheet with new columns.
@@ -177,42 +177,88 @@ class SheetsInitializer:
         - Commissions (after Total per hour)
         """
         try:
-            ws = self.spreadsheet.worksheet(Config.SHEET_NAME)
+            ws = self._ws_by_title.get(Config.SHEET_NAME)
+            if ws is None:
+                raise gspread.WorksheetNotFound(Config.SHEET_NAME)
 
-            current_headers = ws.row_values(1)
-            logger.info(f"Current Shifts headers: {current_headers}")
+            self._pending.append((ws, _EXPECTED_SHIFTS_HEADERS, []))
 
-            # Expected structure:
-            # ID, Date, EmployeeId, EmployeeName, Clock in, Clock out,
-            # Worked hours/shift, Model A, Model B, Model C, ...,
-            # Total sales, Net sales, %, Total per hour, Commissions, Total made
+        except gspread.WorksheetNotFound:
+            logger.error(f"Worksheet '{Config.SHEET_NAME}' not found")
+            raise
 
-            base_headers = ["ID", "Date", "EmployeeId", "EmployeeName", "Clock in", "Clock out", "Worked hours/shift"]
-            tail_headers = ["Total sales", "Net sales", "%", "Total per hour", "Commissions", "Total made"]
+    @staticmethod
+    def _row_data(rows: Sequence[Sequence[str]]) -> List[dict]:
+        """Convert plain rows to RowData for spreadsheets.batchUpdate.
 
-            new_headers = base_headers + Config.PRODUCTS + tail_headers
+        Args:
+            rows: Rows of cell values
 
-            if current_headers != new_headers:
-                ws.update("A1", [new_headers], value_input_option="RAW")
-                logger.info("Shifts headers updated with new columns")
+        Returns:
+            List of RowData objects with string values
+        """
+        return [
+            {"values": [{"userEnteredValue": {"stringValue": str(value)}} for value in row]}
+            for row in rows
+        ]
+
+    def apply_pending(self) -> None:
+        """Write headers and seed rows for all collected sheets.
+
+        Reads the first two rows of every sheet in one values.batchGet and
+        applies all missing headers (updateCells) and seed data (appendCells)
+        in one spreadsheets.batchUpdate, so the whole init costs a single
+        write request against the quota.
+        """
+        if not self._pending:
+            return
+
+        response = sheets_call(
+            self.spreadsheet.values_batch_get,
+            ranges=[f"'{ws.title}'!1:2" for ws, _, _ in self._pending]
+        )
+
+        requests = []
+        for (ws, headers, seed_rows), value_range in zip(self._pending, response["valueRanges"]):
+            values = value_range.get("values", [])
+            existing_headers = values[0] if values else []
+
+            if tuple(existing_headers) != tuple(headers):
+                requests.append({
+                    "updateCells": {
+                        "start": {"sheetId": ws.id, "rowIndex": 0, "columnIndex": 0},
+                        "rows": self._row_data([headers]),
+                        "fields": "userEnteredValue",
+                    }
+                })
+                logger.info(f"{ws.title} headers set")
             else:
-                logger.info("Shifts headers already up to date")
+                logger.info(f"{ws.title} headers already up to date")
 
-        except gspread.WorksheetNotFound:
-            logger.error(f"Worksheet '{Config.SHEET_NAME}' not found")
-            raise
+            # Seed only sheets that have nothing below the header row
+            if seed_rows and len(values) <= 1:
+                requests.append({
+                    "appendCells": {
+                        "sheetId": ws.id,
+                        "rows": self._row_data(seed_rows),
+                        "fields": "userEnteredValue",
+                    }
+                })
+                logger.info(f"{ws.title} default data added")
+
+        if requests:
+            sheets_call(self.spreadsheet.batch_update, {"requests": requests})
+
+        self._pending.clear()
 
     def run(self) -> None:
         """Run all initialization steps."""
         logger.info("Starting sheets initialization...")
 
         try:
-            self.init_employee_settings()
-            self.init_dynamic_rates()
-            self.init_ranks()
-            self.init_employee_ranks()
-            self.init_active_bonuses()
+            self.init_sheets()
             self.update_shifts_headers()
+            self.apply_pending()
 
             logger.info("✅ All sheets initialized successfully!")
 
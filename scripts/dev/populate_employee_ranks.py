@@ -7,15 +7,18 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 import logging
-from datetime import datetime
+from collections import defaultdict
 
 from sheets_service import SheetsService
-from rank_service import RankService
-from time_utils import parse_dt
+from _shared import get_client, sheets_call
+from time_utils import now_et, format_dt
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Employee ids used by add_test_data.py and other dev fixtures
+TEST_EMPLOYEE_IDS = frozenset({"111111", "222222", "333333", "444444", "555555"})
+
 
 def populate_employee_ranks():
     """Populate EmployeeRanks for all existing shifts."""
@@ -23,11 +26,10 @@ def populate_employee_ranks():
     print("POPULATING EMPLOYEE RANKS")
     print("="*60)
 
-    sheets = SheetsService()
-    rank_service = RankService(sheets)
+    sheets = SheetsService(client=get_client())
 
     # Get all shifts
-    all_shifts = sheets.get_all_shifts()
+    all_shifts = sheets_call(sheets.get_all_shifts_fast)
 
     if not all_shifts:
         print("❌ No shifts found")
@@ -36,69 +38,63 @@ def populate_employee_ranks():
     print(f"\nFound {len(all_shifts)} total shifts")
 
     # Filter out test users
-    test_employee_ids = ["111111", "222222", "333333", "444444", "555555"]
     real_shifts = [s for s in all_shifts
-                   if str(s.get("EmployeeId")) not in test_employee_ids]
+                   if str(s.get("EmployeeId")) not in TEST_EMPLOYEE_IDS]
 
     print(f"Real user shifts: {len(real_shifts)}")
 
-    # Group shifts by employee and month
-    employee_months = {}
+    # Group shifts by employee and month.
+    # Dates are fixed-width "YYYY/MM/DD HH:MM:SS", so year and month are read
+    # straight from the string instead of a full parse_dt() per shift.
+    employee_months = defaultdict(list)
 
     for shift in real_shifts:
         employee_id = str(shift.get("EmployeeId"))
-        date_str = shift.get("Date", "")
+        date_str = str(shift.get("Date", ""))
 
         if not employee_id or not date_str:
             continue
 
         try:
-            date = parse_dt(date_str)
-            year = date.year
-            month = date.month
-
-            key = (employee_id, year, month)
-
-            if key not in employee_months:
-                employee_months[key] = []
-
-            employee_months[key].append(shift)
-        except Exception as e:
+            year = int(date_str[0:4])
+            month = int(date_str[5:7])
+        except ValueError as e:
             logger.warning(f"Failed to parse date for shift {shift.get('ID')}: {e}")
             continue
 
+        employee_months[(employee_id, year, month)].append(shift)
+
     print(f"\nUnique employee-months: {len(employee_months)}")
     print("\n" + "="*60)
     print("Processing...")
     print("="*60)
 
-    # Process each employee-month
+    # Compute every rank from the shifts already grouped here; EmployeeRanks
+    # is read once and all changes are written in one batch update
+    results = sheets_call(sheets.update_employee_ranks_bulk, employee_months, format_dt(now_et()))
+
     processed = 0
+    # Per-key report lines, written to stdout once after the loop
+    lines = []
     for (employee_id, year, month), shifts in employee_months.items():
-        try:
-            print(f"\nEmployee {employee_id} - {year}/{month:02d}")
-            print(f"  Shifts in this month: {len(shifts)}")
-
-            # Check and update rank
-            rank_change = rank_service.check_and_update_rank(
-                int(employee_id),
-                year,
-                month
-            )
-
-            if rank_change:
-                if rank_change.get("changed"):
-                    print(f"  ✅ Rank set: {rank_change.get('new_rank')}")
-                else:
-                    print(f"  ℹ️  Rank already set")
-            else:
-                print(f"  ✅ Initial rank created")
-
-            processed += 1
-
-        except Exception as e:
-            print(f"  ❌ Error: {e}")
-            logger.error(f"Failed to process {employee_id} {year}/{month}: {e}")
+        lines.append(f"\nEmployee {employee_id} - {year}/{month:02d}\n")
+        lines.append(f"  Shifts in this month: {len(shifts)}\n")
+
+        result = results[(employee_id, year, month)]
+        if "error" in result:
+            lines.append(f"  ❌ Error: {result['error']}\n")
+            continue
+
+        if result["created"]:
+            lines.append(f"  ✅ Initial rank created: {result['new_rank']}\n")
+        elif result["changed"]:
+            lines.append(f"  ✅ Rank set: {result['new_rank']}\n")
+        else:
+            lines.append("  ℹ️  Rank already set\n")
+
+        processed += 1
+
+    sys.stdout.write("".join(lines))
 
     print("\n" + "="*60)
     print(f"✅ COMPLETED: Processed {processed}/{len(employee_months)} employee-months")
@@ -109,23 +105,19 @@ def populate_employee_ranks():
     print("EMPLOYEE RANKS TABLE")
     print("="*60)
 
-    import gspread
-    from config import Config
-
-    client = gspread.service_account(filename=Config.GOOGLE_SA_JSON)
-    spreadsheet = client.open_by_key(Config.SPREADSHEET_ID)
-    ws = spreadsheet.worksheet("EmployeeRanks")
-
-    data = ws.get_all_values()
-
-    for i, row in enumerate(data):
-        if i == 0:
-            print("\nHeaders:")
-            print(" | ".join(row))
-            print("-" * 60)
-        else:
-            # EmployeeId, Current Rank, Month, Year
-            print(f"Employee {row[0]} | {row[1]} | {row[3]}/{row[4]} | Updated: {row[6][:10]}")
+    # Only the 7 used columns; the API trims trailing blanks, so pad rows back
+    resp = sheets_call(sheets.spreadsheet.values_get, "EmployeeRanks!A1:G")
+    data = [row + [""] * (7 - len(row)) for row in resp.get("values", [])]
+
+    if data:
+        print("\nHeaders:")
+        print(" | ".join(data[0]))
+        print("-" * 60)
+        # EmployeeId, Current Rank, Month, Year
+        sys.stdout.write("".join(
+            f"Employee {row[0]} | {row[1]} | {row[3]}/{row[4]} | Updated: {row[6][:10]}\n"
+            for row in data[1:]
+        ))
 
     print()
 
@@ -10,7 +10,7 @@ import logging
 from decimal import Decimal
 from datetime import datetime
 
-from sheets_service import SheetsService
+from _shared import get_sheets
 from rank_service import RankService
 from time_utils import format_dt, now_et
 
@@ -24,7 +24,7 @@ def test_employee_settings():
     print("TEST 1: Employee Settings")
     print("="*60)
 
-    sheets = SheetsService()
+    sheets = get_sheets()
     employee_id = 120962578
 
     settings = sheets.get_employee_settings(employee_id)
@@ -43,7 +43,7 @@ def test_dynamic_rates():
     print("TEST 2: Dynamic Rates")
     print("="*60)
 
-    sheets = SheetsService()
+    sheets = get_sheets()
 
     # Get all rates
     rates = sheets.get_dynamic_rates()
@@ -65,7 +65,7 @@ def test_ranks():
     print("TEST 3: Rank System")
     print("="*60)
 
-    sheets = SheetsService()
+    sheets = get_sheets()
 
     # Get all ranks
     ranks = sheets.get_ranks()
@@ -93,7 +93,7 @@ def test_rank_service():
     print("TEST 4: Rank Service")
     print("="*60)
 
-    sheets = SheetsService()
+    sheets = get_sheets()
     rank_service = RankService(sheets)
 
     # Test ranks info
@@ -108,7 +108,7 @@ def test_active_bonuses():
     print("TEST 5: Active Bonuses")
     print("="*60)
 
-    sheets = SheetsService()
+    sheets = get_sheets()
     employee_id = 120962578
 
     bonuses = sheets.get_active_bonuses(employee_id)
@@ -167,6 +167,9 @@ def main():
     print("="*60)
 
     try:
+        # Load EmployeeSettings, DynamicRates and Ranks in a single request
+        get_sheets().prefetch_config()
+
         test_employee_settings()
         test_dynamic_rates()
         test_ranks()
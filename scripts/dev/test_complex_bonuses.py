@@ -10,7 +10,7 @@ import logging
 from decimal import Decimal
 from datetime import datetime
 
-from sheets_service import SheetsService
+from _shared import get_sheets
 from time_utils import format_dt, now_et
 
 logging.basicConfig(level=logging.INFO)
@@ -23,7 +23,7 @@ def test_get_models_from_shift():
     print("TEST 1: Get Models from Shift")
     print("="*60)
 
-    sheets = SheetsService()
+    sheets = get_sheets()
 
     # Mock shift with products
     shift = {
@@ -49,7 +49,7 @@ def test_find_previous_shift():
     print("TEST 2: Find Previous Shift")
     print("="*60)
 
-    sheets = SheetsService()
+    sheets = get_sheets()
     employee_id = 120962578
 
     # Get a recent shift
@@ -87,7 +87,7 @@ def test_find_shifts_with_model():
     print("TEST 3: Find Shifts with Model")
     print("="*60)
 
-    sheets = SheetsService()
+    sheets = get_sheets()
     employee_id = 120962578
 
     # Get a recent shift
@@ -127,7 +127,7 @@ def test_apply_percent_prev_bonus():
     print("TEST 4: Apply percent_prev Bonus")
     print("="*60)
 
-    sheets = SheetsService()
+    sheets = get_sheets()
     employee_id = 120962578
 
     # Get a recent shift
@@ -154,7 +154,7 @@ def test_apply_percent_all_bonus():
     print("TEST 5: Apply percent_all Bonus")
     print("="*60)
 
-    sheets = SheetsService()
+    sheets = get_sheets()
     employee_id = 120962578
 
     # Get a recent shift
@@ -182,6 +182,9 @@ def main():
     print("="*60)
 
     try:
+        # Index all shifts once instead of re-scanning the sheet per lookup
+        get_sheets().build_indexes()
+
         test_get_models_from_shift()
         test_find_previous_shift()
         test_find_shifts_with_model()
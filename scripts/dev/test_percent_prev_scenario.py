@@ -7,33 +7,36 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 import logging
+import random
 from decimal import Decimal
-from datetime import datetime, timedelta
 
+from _shared import get_client, get_sheets
 from sheets_service import SheetsService
-from time_utils import format_dt, now_et, parse_dt
+from time_utils import now_et
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
 def create_test_data():
-    """Create test data for percent_prev scenario."""
+    """Create all test shifts for the percent_prev scenarios in one request.
+
+    Returns:
+        Dict with shift IDs keyed by employee ID plus "base_date", or None on failure.
+    """
     print("\n" + "="*60)
     print("CREATING TEST DATA")
     print("="*60)
 
-    sheets = SheetsService()
-
-    # Current time
-    now = now_et()
+    sheets = get_sheets()
 
     # Create test scenario:
     # Employee 1 (111): sold Model A at 10:00
     # Employee 2 (222): sold Model B at 11:00
     # Employee 3 (333): will get bonus at 12:00, selling Model A and Model B
+    # Employee 4 (444): sold Model A + Model B at 14:00 (previous shift for 555)
 
-    base_date = now.strftime("%Y/%m/%d")
+    base_date = now_et().strftime("%Y/%m/%d")
 
     # Shift 1: Employee 111, 10:00, Model A only
     shift1_data = {
@@ -59,44 +62,49 @@ def create_test_data():
         }
     }
 
-    try:
-        print("\nCreating shift 1 (Employee 111, Model A, 10:00)...")
-        shift1_id = sheets.create_shift(shift1_data)
-        print(f"✅ Shift {shift1_id} created")
+    # Shift 3: Employee 444, 14:00, Model A + Model B
+    shift3_data = {
+        "employee_id": 444,
+        "employee_name": "TestUser4",
+        "date": f"{base_date} 14:00:00",
+        "clock_in": f"{base_date} 12:00:00",
+        "clock_out": f"{base_date} 20:00:00",
+        "products": {
+            "Model A": 400.00,
+            "Model B": 600.00,
+        }
+    }
 
-        print("\nCreating shift 2 (Employee 222, Model B, 11:00)...")
-        shift2_id = sheets.create_shift(shift2_data)
-        print(f"✅ Shift {shift2_id} created")
+    try:
+        print("\nCreating shifts for employees 111 (10:00), 222 (11:00) and 444 (14:00)...")
+        shift1_id, shift2_id, shift3_id = sheets.create_shifts_bulk(
+            [shift1_data, shift2_data, shift3_data]
+        )
 
         print("\n" + "="*60)
         print("TEST DATA CREATED SUCCESSFULLY")
         print("="*60)
         print(f"\nShift {shift1_id}: Employee 111, Model A=$500, Date={base_date} 10:00")
         print(f"Shift {shift2_id}: Employee 222, Model B=$800, Date={base_date} 11:00")
+        print(f"Shift {shift3_id}: Employee 444, Model A=$400 + Model B=$600, Date={base_date} 14:00")
 
-        return shift1_id, shift2_id, base_date
+        return {111: shift1_id, 222: shift2_id, 444: shift3_id, "base_date": base_date}
 
     except Exception as e:
         print(f"\n❌ Error creating test data: {e}")
         import traceback
         traceback.print_exc()
-        return None, None, None
+        return None
 
 
-def test_percent_prev_with_parallel_employees():
+def test_percent_prev_with_parallel_employees(fixtures):
     """Test percent_prev bonus selection logic."""
     print("\n" + "="*60)
     print("TEST: Percent_prev with 2 parallel employees")
     print("="*60)
 
-    sheets = SheetsService()
-
-    # Create test data
-    shift1_id, shift2_id, base_date = create_test_data()
-
-    if not shift1_id or not shift2_id:
-        print("❌ Failed to create test data")
-        return
+    sheets = get_sheets()
+    base_date = fixtures["base_date"]
 
     print("\n" + "="*60)
     print("SCENARIO:")
@@ -171,34 +179,15 @@ def test_percent_prev_with_parallel_employees():
         print(f"\n❌ BONUS CALCULATION WRONG! Got ${bonus_amount:.2f}, expected ${expected_bonus:.2f}")
 
 
-def test_percent_prev_with_multiple_models():
+def test_percent_prev_with_multiple_models(fixtures):
     """Test percent_prev when previous employee sold multiple models."""
     print("\n" + "="*60)
     print("TEST: Percent_prev with previous employee having multiple models")
     print("="*60)
 
-    sheets = SheetsService()
-    now = now_et()
-    base_date = now.strftime("%Y/%m/%d")
-
-    # Create shift with multiple models for Employee 444
-    shift_data = {
-        "employee_id": 444,
-        "employee_name": "TestUser4",
-        "date": f"{base_date} 14:00:00",
-        "clock_in": f"{base_date} 12:00:00",
-        "clock_out": f"{base_date} 20:00:00",
-        "products": {
-            "Model A": 400.00,
-            "Model B": 600.00,
-        }
-    }
+    base_date = fixtures["base_date"]
 
     try:
-        print("\nCreating shift (Employee 444, Model A + Model B, 14:00)...")
-        shift_id = sheets.create_shift(shift_data)
-        print(f"✅ Shift {shift_id} created")
-
         # Simulate current shift for employee 555
         current_shift = {
             "Date": f"{base_date} 15:00:00",
@@ -213,20 +202,29 @@ def test_percent_prev_with_multiple_models():
         print("="*60)
         print("Previous employee (444) sold Model A ($400) + Model B ($600)")
         print("Current employee (555) sold Model A ($100) + Model B ($200)")
-        print("\nExpected: Random selection of Model A or Model B from previous shift")
+        print("\nExpected: seeded selection Model A ($3.20), then Model B ($4.80)")
         print("="*60)
 
-        # Apply bonus multiple times to see randomness
-        print("\nApplying bonus 5 times to test randomness:")
-        for i in range(5):
-            bonus = sheets.apply_percent_prev_bonus(
+        # Seed 4 picks Model A then Model B, covering both branches in 2 calls
+        seeded = SheetsService(client=get_client(), rng=random.Random(4))
+        seeded.prime_cache()  # Sheet is unchanged between attempts
+        expected = [Decimal("3.20"), Decimal("4.80")]
+
+        bonuses = [
+            seeded.apply_percent_prev_bonus(
                 employee_id=555,
                 current_shift=current_shift,
                 bonus_value=1.0
             )
-            print(f"  Attempt {i+1}: ${bonus:.2f}")
+            for _ in expected
+        ]
+        for i, bonus in enumerate(bonuses, start=1):
+            print(f"  Attempt {i}: ${bonus:.2f}")
 
-        print("\n✅ Test completed - check logs for selected models")
+        if bonuses == expected:
+            print("\n✅✅ SEEDED SELECTION CORRECT!")
+        else:
+            print(f"\n❌ WRONG! Got {[f'${b:.2f}' for b in bonuses]}, expected $3.20, $4.80")
 
     except Exception as e:
         print(f"\n❌ Error: {e}")
@@ -234,14 +232,15 @@ def test_percent_prev_with_multiple_models():
         traceback.print_exc()
 
 
-def cleanup_test_data():
-    """Clean up test data."""
+def cleanup_test_data(fixtures):
+    """Delete the shifts created by create_test_data()."""
     print("\n" + "="*60)
     print("CLEANUP")
     print("="*60)
-    print("⚠️  Manual cleanup required:")
-    print("   Please delete test shifts for employees 111, 222, 444, 555")
-    print("   from Google Sheets if needed")
+
+    shift_ids = [shift_id for key, shift_id in fixtures.items() if key != "base_date"]
+    deleted = get_sheets().delete_shifts(shift_ids)
+    print(f"🧹 Deleted {deleted} test shifts ({', '.join(map(str, shift_ids))})")
 
 
 def main():
@@ -250,15 +249,18 @@ def main():
     print("PERCENT_PREV BONUS - DETAILED TESTING")
     print("="*60)
 
+    # Shared by both tests: created once, always deleted at the end
+    fixtures = create_test_data()
+    if not fixtures:
+        print("❌ Failed to create test data")
+        return 1
+
     try:
         # Test 1: Two parallel employees
-        test_percent_prev_with_parallel_employees()
+        test_percent_prev_with_parallel_employees(fixtures)
 
         # Test 2: Multiple models in previous shift
-        test_percent_prev_with_multiple_models()
-
-        # Cleanup
-        cleanup_test_data()
+        test_percent_prev_with_multiple_models(fixtures)
 
         print("\n" + "="*60)
         print("✅ ALL TESTS COMPLETED")
@@ -270,6 +272,9 @@ def main():
         traceback.print_exc()
         return 1
 
+    finally:
+        cleanup_test_data(fixtures)
+
     return 0
 
 
@@ -7,8 +7,10 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 import logging
+import random
 from decimal import Decimal
 
+from _shared import get_client, get_sheets
 from sheets_service import SheetsService
 
 logging.basicConfig(level=logging.INFO)
@@ -21,7 +23,7 @@ def verify_scenario_1():
     print("SCENARIO 1: Two parallel employees")
     print("="*60)
 
-    sheets = SheetsService()
+    sheets = get_sheets()
 
     # Charlie's shift (should find Bob as previous)
     print("\nTesting Charlie's shift (12:30)...")
@@ -102,7 +104,7 @@ def verify_scenario_2():
     print("SCENARIO 2: Previous employee with multiple models")
     print("="*60)
 
-    sheets = SheetsService()
+    sheets = get_sheets()
 
     print("\nTesting for Diana's shift (14:00)...")
     print("Diana sold: Model A ($400) + Model B ($600)")
@@ -133,14 +135,18 @@ def verify_scenario_2():
         print("\n❌ No previous shift found")
         return False
 
-    # Test randomness - run 5 times
+    # Seeded selection: seed 4 picks Model A then Model B
     print("\n" + "─" * 60)
-    print("Testing randomness (5 attempts):")
-    print("Expected range: $3.20 (Model A) or $4.80 (Model B)")
+    print("Testing seeded selection (2 attempts):")
+    print("Expected: $3.20 (Model A), then $4.80 (Model B)")
+
+    seeded = SheetsService(client=get_client(), rng=random.Random(4))
+    seeded.prime_cache()  # Sheet is unchanged between attempts
+    expected = [Decimal("3.20"), Decimal("4.80")]
 
     results = []
-    for i in range(5):
-        bonus = sheets.apply_percent_prev_bonus(
+    for i in range(len(expected)):
+        bonus = seeded.apply_percent_prev_bonus(
             employee_id=555555,
             current_shift=next_shift,
             bonus_value=1.0
@@ -156,15 +162,12 @@ def verify_scenario_2():
 
         print(f"  Attempt {i+1}: ${bonus:.2f} ({model})")
 
-    # Check if we have variation (randomness working)
-    unique_values = set(results)
-    if len(unique_values) > 1:
-        print("\n✅✅ RANDOMNESS WORKING! Different models selected")
+    if results == expected:
+        print("\n✅✅ SEEDED SELECTION CORRECT! Both models covered")
         return True
     else:
-        print(f"\n⚠️  All attempts returned same value: ${results[0]:.2f}")
-        print("This is possible (1/32 chance), but might indicate issue")
-        return True  # Still ok, just unlikely
+        print(f"\n❌ WRONG! Got {[f'${b:.2f}' for b in results]}, expected $3.20, $4.80")
+        return False
 
 
 def main():
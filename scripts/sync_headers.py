@@ -9,7 +9,9 @@ from dotenv import load_dotenv
 load_dotenv()
 
 import gspread
-from google.oauth2.service_account import Credentials
+from gspread.utils import rowcol_to_a1
+
+from services.sheets_client import get_sheets_client
 
 # Expected headers for each sheet
 SHEET_HEADERS = {
@@ -29,6 +31,12 @@ SHEET_HEADERS = {
     ]
 }
 
+# Header row range per sheet, e.g. 'A1:S1' (rowcol_to_a1 handles columns past Z)
+HEADER_RANGES = {
+    sheet_name: f"A1:{rowcol_to_a1(1, len(headers))}"
+    for sheet_name, headers in SHEET_HEADERS.items()
+}
+
 def main():
     spreadsheet_id = os.getenv('SPREADSHEET_ID')
     if not spreadsheet_id:
@@ -38,14 +46,7 @@ def main():
     print(f"Connecting to spreadsheet: {spreadsheet_id}")
 
     # Connect to Google Sheets
-    scopes = [
-        'https://www.googleapis.com/auth/spreadsheets',
-        'https://www.googleapis.com/auth/drive'
-    ]
-    creds = Credentials.from_service_account_file(
-        'google_sheets_credentials.json', scopes=scopes
-    )
-    client = gspread.authorize(creds)
+    client = get_sheets_client()
     spreadsheet = client.open_by_key(spreadsheet_id)
 
     print(f"Connected to: {spreadsheet.title}\n")
@@ -63,16 +64,20 @@ def main():
                 print(f"  Status: OK\n")
             else:
                 # Update headers
-                last_col = chr(ord('A') + len(expected_headers) - 1)
-                worksheet.update(f'A1:{last_col}1', [expected_headers])
+                worksheet.update(
+                    range_name=HEADER_RANGES[sheet_name], values=[expected_headers],
+                    value_input_option='RAW'
+                )
                 print(f"  Status: UPDATED\n")
 
         except gspread.WorksheetNotFound:
             print(f"=== {sheet_name} ===")
             print(f"  Status: SHEET NOT FOUND - creating...")
             worksheet = spreadsheet.add_worksheet(title=sheet_name, rows=1000, cols=len(expected_headers))
-            last_col = chr(ord('A') + len(expected_headers) - 1)
-            worksheet.update(f'A1:{last_col}1', [expected_headers])
+            worksheet.update(
+                range_name=HEADER_RANGES[sheet_name], values=[expected_headers],
+                value_input_option='RAW'
+            )
             print(f"  Status: CREATED\n")
 
     print("Done!")
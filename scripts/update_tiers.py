@@ -64,17 +64,15 @@ def main():
         # Обновить тиры всех сотрудников
         results = service.update_all_employee_tiers(year, month)
 
-        # Вывести результаты
-        changed_count = 0
-        for result in results:
-            status = "ИЗМЕНЁН" if result['changed'] else "без изменений"
-            logger.info(
+        # Вывести результаты одной записью лога вместо записи на каждого сотрудника
+        changed_count = sum(1 for result in results if result['changed'])
+        if results:
+            logger.info("\n".join(
                 f"  {result['employee_name']}: "
                 f"${result['total_sales']:,.0f} → {result['new_tier']} ({result['new_percentage']}%) "
-                f"[{status}]"
-            )
-            if result['changed']:
-                changed_count += 1
+                f"[{'ИЗМЕНЁН' if result['changed'] else 'без изменений'}]"
+                for result in results
+            ))
 
         logger.info("-" * 60)
         logger.info(f"Всего сотрудников: {len(results)}")
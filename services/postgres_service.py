@@ -16,17 +16,31 @@ Date: 2025-11-11
 Version: 3.1.0
 """
 
+import io
 import logging
-from typing import Dict, List, Optional
+import queue
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from bisect import bisect_right
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional
 from decimal import Decimal
 from datetime import datetime, date
 import psycopg2
-from psycopg2 import sql, extras
+from psycopg2 import sql, extras, extensions, pool
 
 from config import Config
+from src.time_utils import month_bounds
 
 logger = logging.getLogger(__name__)
 
+# Net sales are 80% of total sales; commission_pct is a percentage of net sales
+_NET_SALES_RATIO = Decimal('0.8')
+_PCT = Decimal('0.01')
+_NET_COMMISSION_RATE = _NET_SALES_RATIO * _PCT  # commission per 1% of total sales
+
 
 def get_db_connection(**params):
     """Get PostgreSQL connection with RealDictCursor."""
@@ -39,6 +53,252 @@ def get_db_connection(**params):
     )
 
 
+class PreparingConnection(extensions.connection):
+    """Connection that remembers the statements it has PREPAREd.
+
+    Prepared statements live as long as the server session, so the names
+    stay valid while the connection is idle in the pool.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+
+
+# Connections discarded by the pool are closed by a background thread, so the
+# caller returning a connection doesn't wait on the close handshake
+_close_queue: "queue.SimpleQueue" = queue.SimpleQueue()
+_closer_thread: Optional[threading.Thread] = None
+_closer_lock = threading.Lock()
+
+
+def _close_worker() -> None:
+    while True:
+        conn = _close_queue.get()
+        if conn is None:
+            # Sentinel from _stop_closer()
+            return
+        try:
+            conn.close()
+        except Exception as e:
+            logger.debug(f"Failed to close discarded connection: {e}")
+
+
+def _close_later(conn) -> None:
+    """Hand a discarded connection to the background closer thread."""
+    global _closer_thread
+    with _closer_lock:
+        if _closer_thread is None:
+            _closer_thread = threading.Thread(
+                target=_close_worker, name="pg-conn-closer", daemon=True
+            )
+            _closer_thread.start()
+        _close_queue.put(conn)
+
+
+def _stop_closer() -> None:
+    """Close the connections already handed over and stop the closer thread.
+
+    The next _close_later() starts a new thread.
+    """
+    global _closer_thread
+    with _closer_lock:
+        thread, _closer_thread = _closer_thread, None
+        if thread is not None:
+            _close_queue.put(None)
+    if thread is not None:
+        thread.join()
+
+
+class CachingConnectionPool:
+    """Thread-safe connection pool that keeps overflow connections for reuse.
+
+    psycopg2's own pools close every connection returned while minconn are
+    already idle, so bursts above minconn reconnect on each call. Here
+    returned connections stay idle (up to maxconn) and are closed once
+    unused for idle_timeout seconds; minconn connections are always kept.
+    session_sql runs once on each new connection. When all maxconn are
+    checked out, getconn() waits up to timeout seconds for one to be
+    returned instead of failing at once. Discarded connections are closed
+    in the background; closeall() closes synchronously and waits for the
+    background closer to finish.
+
+    Same interface as psycopg2.pool.ThreadedConnectionPool (getconn(),
+    putconn(conn, close=False), closeall(), closed), built on the public
+    connection API only.
+    """
+
+    def __init__(self, minconn, maxconn, *args, idle_timeout: float = 60.0,
+                 timeout: float = 30.0, session_sql: str = "", **kwargs):
+        self.minconn = int(minconn)
+        self.maxconn = int(maxconn)
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.session_sql = session_sql
+        self.closed = False
+
+        self._args = args
+        self._kwargs = kwargs
+        self._lock = threading.Lock()
+        # One slot per connection that may be checked out at a time
+        self._slots = threading.BoundedSemaphore(self.maxconn)
+        self._idle: List[tuple] = []  # (returned_at, conn), oldest first
+        self._used: Dict[int, extensions.connection] = {}  # id(conn) -> conn
+
+        for _ in range(self.minconn):
+            self._idle.append((time.monotonic(), self._connect()))
+
+    def _connect(self) -> extensions.connection:
+        conn = psycopg2.connect(*self._args, **self._kwargs)
+        if self.session_sql:
+            # Session settings outlive transactions: apply once per physical
+            # connection instead of on every checkout
+            with conn.cursor() as cursor:
+                cursor.execute(self.session_sql)
+            conn.commit()
+        return conn
+
+    def _evict_idle(self) -> None:
+        """Close idle connections past idle_timeout, oldest first (lock held)."""
+        cutoff = time.monotonic() - self.idle_timeout
+        # getconn takes the most recently returned connection from the end
+        while len(self._idle) > self.minconn and self._idle[0][0] < cutoff:
+            _, conn = self._idle.pop(0)
+            _close_later(conn)
+
+    def getconn(self) -> extensions.connection:
+        """Check out a connection, reusing an idle one if there is any.
+
+        Waits up to timeout seconds while all maxconn are checked out.
+
+        Raises:
+            pool.PoolError: If the pool is closed or no connection was
+                returned within timeout.
+        """
+        if not self._slots.acquire(timeout=self.timeout):
+            raise pool.PoolError("connection pool exhausted")
+
+        try:
+            with self._lock:
+                if self.closed:
+                    raise pool.PoolError("connection pool is closed")
+                self._evict_idle()
+
+                if self._idle:
+                    _, conn = self._idle.pop()
+                else:
+                    conn = self._connect()
+
+                self._used[id(conn)] = conn
+                return conn
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def putconn(self, conn, close: bool = False) -> None:
+        """Return a checked-out connection (open transactions are rolled back).
+
+        Args:
+            conn: Connection from getconn()
+            close: Discard the connection instead of keeping it for reuse
+        """
+        with self._lock:
+            if self.closed:
+                raise pool.PoolError("connection pool is closed")
+            if self._used.pop(id(conn), None) is None:
+                raise pool.PoolError("trying to put unkeyed connection")
+
+            if not close and not conn.closed:
+                status = conn.info.transaction_status
+                if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                    # Server connection lost
+                    close = True
+                elif status != extensions.TRANSACTION_STATUS_IDLE:
+                    # Connection in error or in transaction
+                    try:
+                        conn.rollback()
+                    except psycopg2.Error:
+                        close = True
+
+            if close or conn.closed:
+                _close_later(conn)
+            else:
+                self._idle.append((time.monotonic(), conn))
+            self._evict_idle()
+        self._slots.release()
+
+    def closeall(self) -> None:
+        """Close all idle and checked-out connections; the pool is unusable after."""
+        with self._lock:
+            if self.closed:
+                raise pool.PoolError("connection pool is closed")
+            for conn in [conn for _, conn in self._idle] + list(self._used.values()):
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            self._idle.clear()
+            self._used.clear()
+            self.closed = True
+        _stop_closer()
+
+
+# Process-wide connection pools keyed by connection parameters
+_pools: Dict[tuple, CachingConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_connection_pool(**params) -> CachingConnectionPool:
+    """Get the shared connection pool for these connection parameters.
+
+    Connections handed out by the pool use RealDictCursor, same as
+    get_db_connection().
+    """
+    db_params = Config.get_db_params()
+    db_params.update(params)
+    key = tuple(sorted(db_params.items()))
+
+    with _pools_lock:
+        conn_pool = _pools.get(key)
+        if conn_pool is None:
+            conn_pool = CachingConnectionPool(
+                Config.DB_POOL_MIN,
+                Config.DB_POOL_MAX,
+                **db_params,
+                connection_factory=PreparingConnection,
+                cursor_factory=extras.RealDictCursor,
+                idle_timeout=Config.DB_POOL_IDLE_TIMEOUT,
+                timeout=Config.DB_POOL_TIMEOUT,
+                session_sql=Config.DB_SESSION_SQL
+            )
+            _pools[key] = conn_pool
+
+    return conn_pool
+
+
+def close_connection_pools() -> None:
+    """Close every connection of every shared pool (call on shutdown)."""
+    with _pools_lock:
+        for conn_pool in _pools.values():
+            conn_pool.closeall()
+        _pools.clear()
+
+
+@contextmanager
+def get_connection(**params) -> Iterator[extensions.connection]:
+    """Borrow a connection from the shared pool for the body of a with block.
+
+    The connection goes back to the pool on exit; the caller commits or
+    rolls back, anything left open is rolled back by the pool.
+    """
+    conn_pool = get_connection_pool(**params)
+    conn = conn_pool.getconn()
+    try:
+        yield conn
+    finally:
+        conn_pool.putconn(conn)
+
+
 class PostgresService:
     """PostgreSQL service - drop-in replacement for SheetsService.
 
@@ -55,42 +315,49 @@ class PostgresService:
         self.db_params = db_params
         self.cache_manager = cache_manager
 
-        # Test connection
+        # Create the pool (opens the first connection) and test it
         try:
-            conn = get_db_connection(**self.db_params)
-            conn.close()
+            self._pool = get_connection_pool(**self.db_params)
+            conn = self._get_conn()
+            self._put_conn(conn)
             logger.info("✓ PostgreSQL service initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize PostgreSQL connection: {e}")
             raise
 
     def _get_conn(self):
-        """Get a new database connection."""
-        return get_db_connection(**self.db_params)
+        """Get a database connection from the pool.
 
-    # ========== Shift Management ==========
+        Must be returned with _put_conn() when done.
+        """
+        return self._pool.getconn()
 
-    def get_next_id(self) -> int:
-        """Get next available ID for shift.
+    def _put_conn(self, conn) -> None:
+        """Return a connection to the pool (open transactions are rolled back).
 
-        Returns:
-            Next ID value from sequence
+        Connections that were closed or broken are discarded instead of
+        being handed out again.
         """
-        conn = self._get_conn()
-        cursor = conn.cursor()
+        self._pool.putconn(conn, close=bool(conn.closed))
 
-        try:
-            # Use nextval to get next sequence value
-            cursor.execute("SELECT nextval('shifts_id_seq')")
-            next_id = cursor.fetchone()['nextval']
+    @staticmethod
+    def _execute_prepared(cursor, name: str, param_types: str, query: str, params: tuple) -> None:
+        """Execute a server-side prepared statement, preparing it once per connection.
 
-            # Rollback to not consume the sequence value
-            conn.rollback()
+        Args:
+            cursor: Cursor of a pooled PreparingConnection
+            name: Statement name (unique per query)
+            param_types: Parameter type list, e.g. 'BIGINT'
+            query: Statement text with $1, $2, ... placeholders
+            params: Parameter values
+        """
+        prepared = cursor.connection.prepared
+        if name not in prepared:
+            cursor.execute(f"PREPARE {name} ({param_types}) AS {query}")
+            prepared.add(name)
+        cursor.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
 
-            return next_id
-        finally:
-            cursor.close()
-            conn.close()
+    # ========== Shift Management ==========
 
     def create_shift(self, shift_data: Dict) -> int:
         """Create a new shift with products.
@@ -147,7 +414,10 @@ class PostgresService:
                 worked_hours = Decimal('0')
 
             # Calculate financial fields if not provided
-            net_sales = Decimal(str(shift_data.get('net_sales', total_sales * Decimal('0.8'))))
+            if 'net_sales' in shift_data:
+                net_sales = Decimal(str(shift_data['net_sales']))
+            else:
+                net_sales = total_sales * _NET_SALES_RATIO
 
             # Get employee settings for base commission and hourly wage
             settings = self.get_employee_settings(employee_id)
@@ -163,7 +433,9 @@ class PostgresService:
 
             # Calculate dynamic commission rate based on current shift sales
             shift_date_normalized = shift_date.replace("/", "-")
-            dynamic_rate = Decimal(str(self.calculate_dynamic_rate(employee_id, shift_date_normalized, float(total_sales))))
+            dynamic_rate = Decimal(str(self.calculate_dynamic_rate(
+                employee_id, shift_date_normalized, float(total_sales), cursor=cursor
+            )))
 
             # Commission = base (manual) + dynamic (0-3% based on shift sales)
             commission_pct = base_commission + dynamic_rate
@@ -192,7 +464,10 @@ class PostgresService:
                         logger.info(f"Applied flat bonus {bonus_id}: +${bonus_value}")
 
             # Calculate commissions from net sales
-            commissions = Decimal(str(shift_data.get('commission_amount', net_sales * (commission_pct / Decimal('100')))))
+            if 'commission_amount' in shift_data:
+                commissions = Decimal(str(shift_data['commission_amount']))
+            else:
+                commissions = net_sales * commission_pct * _PCT
 
             # Calculate total made
             total_made = Decimal(str(shift_data.get('total_made', commissions + total_per_hour + flat_bonuses)))
@@ -222,30 +497,29 @@ class PostgresService:
 
             shift_id = cursor.fetchone()['id']
 
-            # Mark applied bonuses as used (pass cursor to use same transaction)
-            for bonus_id in applied_bonus_ids:
-                if bonus_id:
-                    self.apply_bonus(bonus_id, shift_id, cursor=cursor)
-                    logger.info(f"Marked bonus {bonus_id} as applied to shift {shift_id}")
+            # Mark applied bonuses as used in one UPDATE (pass cursor to use same transaction)
+            self.apply_bonuses([bonus_id for bonus_id in applied_bonus_ids if bonus_id], shift_id, cursor=cursor)
 
-            # Insert products (already extracted above)
+            # Insert products (already extracted above) in one statement
+            _, product_ids = self._load_products(cursor)
+            product_rows = []
             for product_name, amount in products.items():
                 amount_decimal = Decimal(str(amount))
                 if amount_decimal > 0:
-                    # Get product_id
-                    cursor.execute("SELECT id FROM products WHERE name = %s", (product_name,))
-                    product = cursor.fetchone()
-
-                    if product:
-                        cursor.execute("""
-                            INSERT INTO shift_products (shift_id, product_id, amount)
-                            VALUES (%s, %s, %s)
-                            ON CONFLICT (shift_id, product_id) DO UPDATE
-                            SET amount = EXCLUDED.amount
-                        """, (shift_id, product['id'], amount_decimal))
+                    product_id = product_ids.get(product_name)
+                    if product_id:
+                        product_rows.append((shift_id, product_id, amount_decimal))
                     else:
                         logger.warning(f"Product '{product_name}' not found in database")
 
+            if product_rows:
+                extras.execute_values(cursor, """
+                    INSERT INTO shift_products (shift_id, product_id, amount)
+                    VALUES %s
+                    ON CONFLICT (shift_id, product_id) DO UPDATE
+                    SET amount = EXCLUDED.amount
+                """, product_rows)
+
             conn.commit()
             logger.info(f"✓ Created shift {shift_id} for employee {employee_id}")
             return shift_id
@@ -256,7 +530,7 @@ class PostgresService:
             raise
         finally:
             cursor.close()
-            conn.close()
+            self._put_conn(conn)
 
     def get_shift_by_id(self, shift_id: int) -> Optional[Dict]:
         """Get shift data by ID with product sales in SheetsService format.
@@ -271,75 +545,162 @@ class PostgresService:
         cursor = conn.cursor()
 
         try:
-            # Get shift base data
-            cursor.execute("SELECT * FROM shifts WHERE id = %s", (shift_id,))
-            shift = cursor.fetchone()
+            shifts = self._fetch_shifts(cursor, [shift_id])
+            return shifts[0] if shifts else None
 
-            if not shift:
-                return None
+        finally:
+            cursor.close()
+            self._put_conn(conn)
 
-            # Convert to SheetsService format
-            result = {
-                'ShiftID': shift['id'],
-                'ID': shift['id'],  # Alias
-                'shift_id': shift['id'],  # Python-style alias
-                'Date': str(shift['date']),
-                'shift_date': str(shift['date']),
-                'EmployeeId': shift['employee_id'],
-                'employee_id': shift['employee_id'],
-                'EmployeeName': shift['employee_name'],
-                'employee_name': shift['employee_name'],
-                'Clock in': shift['clock_in'].strftime('%H:%M') if shift['clock_in'] else '',
-                'time_in': shift['clock_in'].strftime('%H:%M') if shift['clock_in'] else '',
-                'Clock out': shift['clock_out'].strftime('%H:%M') if shift['clock_out'] else '',
-                'time_out': shift['clock_out'].strftime('%H:%M') if shift['clock_out'] else '',
-                'Worked hours/shift': float(shift['worked_hours']) if shift['worked_hours'] else 0,
-                'total_hours': float(shift['worked_hours']) if shift['worked_hours'] else 0,
-                'Total sales': float(shift['total_sales']),
-                'total_sales': float(shift['total_sales']),
-                'Net sales': float(shift['net_sales']),
-                'net_sales': float(shift['net_sales']),
-                '%': float(shift['commission_pct']),
-                'CommissionPct': float(shift['commission_pct']),
-                'commission_pct': float(shift['commission_pct']),
-                'total_commission_pct': float(shift['commission_pct']),
-                'Total per hour': float(shift['total_per_hour']),
-                'total_per_hour': float(shift['total_per_hour']),
-                'Commissions': float(shift['commissions']),
-                'commissions': float(shift['commissions']),
-                'commission_amount': float(shift['commissions']),
-                'Total made': float(shift['total_made']),
-                'total_made': float(shift['total_made']),
-            }
+    def _fetch_shifts(self, cursor, shift_ids: List[int],
+                      all_products: Optional[List[str]] = None) -> List[Dict]:
+        """Load several shifts with their product sales in three queries.
 
-            # Get product sales
-            cursor.execute("""
-                SELECT p.name, sp.amount
-                FROM shift_products sp
-                JOIN products p ON sp.product_id = p.id
-                WHERE sp.shift_id = %s
-            """, (shift_id,))
+        Args:
+            cursor: Open cursor to run queries on
+            shift_ids: Shift IDs to load
+            all_products: Active product names if already loaded (saves a query)
 
-            products = cursor.fetchall()
+        Returns:
+            Shift dicts in SheetsService format, in the order of shift_ids
+            (missing IDs are skipped)
+        """
+        if not shift_ids:
+            return []
+
+        cursor.execute("SELECT * FROM shifts WHERE id = ANY(%s)", (list(shift_ids),))
+        rows = {row['id']: row for row in cursor.fetchall()}
+
+        # Product sales of all requested shifts at once
+        cursor.execute("""
+            SELECT sp.shift_id, p.name, sp.amount
+            FROM shift_products sp
+            JOIN products p ON sp.product_id = p.id
+            WHERE sp.shift_id = ANY(%s)
+        """, (list(rows),))
+        products_by_shift = defaultdict(list)
+        for product_row in cursor.fetchall():
+            products_by_shift[product_row['shift_id']].append(product_row)
+
+        if all_products is None:
+            all_products, _ = self._load_products(cursor)
+
+        result = []
+        for shift_id in shift_ids:
+            shift = rows.get(shift_id)
+            if shift:
+                result.append(self._shift_to_dict(shift, products_by_shift[shift_id], all_products))
+        return result
+
+    def _load_products(self, cursor) -> tuple:
+        """Load the product snapshot, cached briefly.
+
+        Products are edited directly in the database, so the snapshot is
+        only kept for a minute.
 
-            # Initialize all products to 0 (load from DB)
-            all_products = self.get_products()
-            for product_name in all_products:
-                result[product_name] = 0
-                result[f"{product_name.lower()}_sales"] = 0
+        Args:
+            cursor: Open cursor to run the query on (used on a cache miss)
 
-            # Fill in actual product sales
-            for product_row in products:
-                product_name = product_row['name']
-                amount = float(product_row['amount'])
-                result[product_name] = amount
-                result[f"{product_name.lower()}_sales"] = amount
+        Returns:
+            Tuple (active product names in display order, {name: id} of all products)
+        """
+        if self.cache_manager:
+            cached = self.cache_manager.get('products', 'all')
+            if cached is not None:
+                return cached
 
-            return result
+        cursor.execute("""
+            SELECT id, name, is_active FROM products
+            ORDER BY display_order, id
+        """)
+        active = []
+        ids = {}
+        for row in cursor.fetchall():
+            ids.setdefault(row['name'], row['id'])
+            if row['is_active']:
+                active.append(row['name'])
+        result = (active, ids)
 
-        finally:
-            cursor.close()
-            conn.close()
+        if self.cache_manager:
+            self.cache_manager.set('products', 'all', result, ttl=60)
+
+        return result
+
+    @staticmethod
+    def _shift_to_dict(shift: Dict, products: List[Dict], all_products: List[str]) -> Dict:
+        """Convert a shifts row and its product sales to SheetsService format.
+
+        Args:
+            shift: Row from the shifts table
+            products: Rows with name and amount of the shift's product sales
+            all_products: Names of all active products (reported as 0 if not sold)
+
+        Returns:
+            Shift data dict compatible with SheetsService
+        """
+        # Convert each value once; the aliases share it
+        clock_in = shift['clock_in']
+        clock_out = shift['clock_out']
+        time_in = f"{clock_in.hour:02d}:{clock_in.minute:02d}" if clock_in else ''
+        time_out = f"{clock_out.hour:02d}:{clock_out.minute:02d}" if clock_out else ''
+        # Few distinct dates across many shifts: intern so equal dates share one
+        # string and compare by identity when sorting/grouping
+        shift_date = sys.intern(str(shift['date']))
+        worked_hours = float(shift['worked_hours']) if shift['worked_hours'] else 0
+        total_sales = float(shift['total_sales'])
+        net_sales = float(shift['net_sales'])
+        commission_pct = float(shift['commission_pct'])
+        total_per_hour = float(shift['total_per_hour'])
+        commissions = float(shift['commissions'])
+        total_made = float(shift['total_made'])
+
+        # Convert to SheetsService format
+        result = {
+            'ShiftID': shift['id'],
+            'ID': shift['id'],  # Alias
+            'shift_id': shift['id'],  # Python-style alias
+            'Date': shift_date,
+            'shift_date': shift_date,
+            'EmployeeId': shift['employee_id'],
+            'employee_id': shift['employee_id'],
+            'EmployeeName': shift['employee_name'],
+            'employee_name': shift['employee_name'],
+            'Clock in': time_in,
+            'time_in': time_in,
+            'Clock out': time_out,
+            'time_out': time_out,
+            'Worked hours/shift': worked_hours,
+            'total_hours': worked_hours,
+            'Total sales': total_sales,
+            'total_sales': total_sales,
+            'Net sales': net_sales,
+            'net_sales': net_sales,
+            '%': commission_pct,
+            'CommissionPct': commission_pct,
+            'commission_pct': commission_pct,
+            'total_commission_pct': commission_pct,
+            'Total per hour': total_per_hour,
+            'total_per_hour': total_per_hour,
+            'Commissions': commissions,
+            'commissions': commissions,
+            'commission_amount': commissions,
+            'Total made': total_made,
+            'total_made': total_made,
+        }
+
+        # Initialize all products to 0
+        for product_name in all_products:
+            result[product_name] = 0
+            result[f"{product_name.lower()}_sales"] = 0
+
+        # Fill in actual product sales
+        for product_row in products:
+            product_name = product_row['name']
+            amount = float(product_row['amount'])
+            result[product_name] = amount
+            result[f"{product_name.lower()}_sales"] = amount
+
+        return result
 
     def find_row_by_id(self, shift_id: int) -> Optional[int]:
         """Find shift row by ID (for compatibility).
@@ -418,7 +779,7 @@ class PostgresService:
             return False
         finally:
             cursor.close()
-            conn.close()
+            self._put_conn(conn)
 
     def recalculate_worked_hours(self, shift_id: int) -> bool:
         """Recalculate worked_hours, total_per_hour, total_made based on clock_in/clock_out.
@@ -485,7 +846,7 @@ class PostgresService:
             return False
         finally:
             cursor.close()
-            conn.close()
+            self._put_conn(conn)
 
     def update_total_sales(self, shift_id: int, total_sales: Decimal) -> bool:
         """Update total sales for a shift.
@@ -517,8 +878,8 @@ class PostgresService:
             hourly_wage = Decimal(str(settings.get("Hourly wage", 15.0))) if settings else Decimal('15.0')
 
             # Recalculate
-            net_sales = total_sales * Decimal('0.8')
-            commissions = net_sales * commission_pct / 100
+            net_sales = total_sales * _NET_SALES_RATIO
+            commissions = total_sales * commission_pct * _NET_COMMISSION_RATE
             total_per_hour = worked_hours * hourly_wage
             total_made = total_per_hour + commissions
 
@@ -550,7 +911,7 @@ class PostgresService:
             return False
         finally:
             cursor.close()
-            conn.close()
+            self._put_conn(conn)
 
     def get_last_shifts(self, employee_id: int, limit: int = 3) -> List[Dict]:
         """Get last N shifts for an employee.
@@ -567,26 +928,20 @@ class PostgresService:
 
         try:
             cursor.execute("""
-                SELECT * FROM shifts
+                SELECT id FROM shifts
                 WHERE employee_id = %s
                 ORDER BY date DESC, clock_in DESC
                 LIMIT %s
             """, (employee_id, limit))
 
-            shifts = cursor.fetchall()
-
-            # Convert each shift to SheetsService format
-            result = []
-            for shift in shifts:
-                shift_dict = self.get_shift_by_id(shift['id'])
-                if shift_dict:
-                    result.append(shift_dict)
+            shift_ids = [row['id'] for row in cursor.fetchall()]
 
-            return result
+            # Convert to SheetsService format
+            return self._fetch_shifts(cursor, shift_ids)
 
         finally:
             cursor.close()
-            conn.close()
+            self._put_conn(conn)
 
     def get_all_shifts(self) -> List[Dict]:
         """Get all shifts.
@@ -594,29 +949,52 @@ class PostgresService:
         Returns:
             List of all shift dicts in SheetsService format
         """
-        conn = self._get_conn()
-        cursor = conn.cursor()
+        return list(self.iter_shifts())
 
-        try:
-            cursor.execute("""
-                SELECT id FROM shifts
-                ORDER BY date DESC, clock_in DESC
-            """)
+    def iter_shifts(self, employee_id: Optional[int] = None) -> Iterator[Dict]:
+        """Stream shifts, newest first, without materializing the whole table.
 
-            shift_ids = cursor.fetchall()
+        Args:
+            employee_id: Only shifts of this employee if given
 
-            # Convert each shift to SheetsService format
-            result = []
-            for row in shift_ids:
-                shift_dict = self.get_shift_by_id(row['id'])
-                if shift_dict:
-                    result.append(shift_dict)
+        Yields:
+            Shift dicts in SheetsService format
+        """
+        conn = self._get_conn()
+        # Named (server-side) tuple cursor: ids are streamed in chunks instead
+        # of materializing the whole table, and no dict is built per row
+        cursor = conn.cursor(name='shifts_scan', cursor_factory=extensions.cursor)
+        cursor.itersize = 2000
+        lookup_cursor = conn.cursor()
 
-            return result
+        try:
+            if employee_id is None:
+                cursor.execute("""
+                    SELECT id FROM shifts
+                    ORDER BY date DESC, clock_in DESC
+                """)
+            else:
+                cursor.execute("""
+                    SELECT id FROM shifts
+                    WHERE employee_id = %s
+                    ORDER BY date DESC, clock_in DESC
+                """, (employee_id,))
+
+            # Convert each chunk of ids to SheetsService format; the product
+            # list is the same for every chunk, so load it once
+            all_products, _ = self._load_products(lookup_cursor)
+            while True:
+                chunk = cursor.fetchmany(cursor.itersize)
+                if not chunk:
+                    break
+                yield from self._fetch_shifts(
+                    lookup_cursor, [shift_id for (shift_id,) in chunk], all_products
+                )
 
         finally:
+            lookup_cursor.close()
             cursor.close()
-            conn.close()
+            self._put_conn(conn)
 
     # ========== Products ==========
 
@@ -626,22 +1004,16 @@ class PostgresService:
         Returns:
             List of product names ordered by display_order
         """
-        # No caching - always fetch fresh (query is fast, products may change)
         conn = self._get_conn()
         cursor = conn.cursor()
 
         try:
-            cursor.execute("""
-                SELECT name FROM products
-                WHERE is_active = TRUE
-                ORDER BY display_order, id
-            """)
-
-            return [row['name'] for row in cursor.fetchall()]
+            active, _ = self._load_products(cursor)
+            return list(active)
 
         finally:
             cursor.close()
-            conn.close()
+            self._put_conn(conn)
 
     # ========== Employee Settings ==========
 
@@ -658,8 +1030,9 @@ class PostgresService:
         cursor = conn.cursor()
 
         try:
-            cursor.execute("""
-                SELECT * FROM employees WHERE telegram_id = %s AND is_active = TRUE
+            self._execute_prepared(cursor, 'employee_settings', 'BIGINT', """
+                SELECT id, name, hourly_wage, sales_commission, is_active
+                FROM employees WHERE telegram_id = $1 AND is_active = TRUE
             """, (employee_id,))
 
             employee = cursor.fetchone()
@@ -688,7 +1061,7 @@ class PostgresService:
 
         finally:
             cursor.close()
-            conn.close()
+            self._put_conn(conn)
 
     def create_default_employee_settings(self, employee_id: int) -> None:
         """Create default employee settings.
@@ -719,7 +1092,7 @@ class PostgresService:
             raise
         finally:
             cursor.close()
-            conn.close()
+            self._put_conn(conn)
 
     def _create_employee_from_shift(self, telegram_id: int, name: str) -> None:
         """Auto-create employee record from shift data.
@@ -753,7 +1126,7 @@ class PostgresService:
             raise
         finally:
             cursor.close()
-            conn.close()
+            self._put_conn(conn)
 
     # ========== Dynamic Rates ==========
 
@@ -801,13 +1174,14 @@ class PostgresService:
 
         finally:
             cursor.close()
-            conn.close()
+            self._put_conn(conn)
 
     def calculate_dynamic_rate(
         self,
         employee_id: int,
         shift_date: str,
-        current_total_sales: float = 0
+        current_total_sales: float = 0,
+        cursor=None
     ) -> float:
         """Calculate dynamic commission rate based on current shift sales.
 
@@ -815,25 +1189,152 @@ class PostgresService:
             employee_id: Employee ID (kept for interface compatibility)
             shift_date: Shift date (kept for interface compatibility)
             current_total_sales: Current shift total sales
+            cursor: Optional cursor to use (for transaction reuse)
 
         Returns:
             Dynamic commission rate percentage (0-3%)
         """
-        conn = self._get_conn()
-        cursor = conn.cursor()
+        # The rate depends only on sales: cache per amount in cents, as long as the rates list
+        cache_key = str(round(float(current_total_sales) * 100))
+        if self.cache_manager:
+            cached = self.cache_manager.get('dynamic_rate', cache_key)
+            if cached is not None:
+                return cached
+
+        # Use provided cursor or create new connection
+        own_connection = cursor is None
+        if own_connection:
+            conn = self._get_conn()
+            cursor = conn.cursor()
 
         try:
-            cursor.execute("SELECT get_dynamic_rate(%s) as rate", (current_total_sales,))
+            self._execute_prepared(
+                cursor, 'dynamic_rate', 'DECIMAL', "SELECT get_dynamic_rate($1) as rate", (current_total_sales,)
+            )
             result = cursor.fetchone()
 
-            return float(result['rate']) if result else 0.0
+            rate = float(result['rate']) if result else 0.0
+
+            if self.cache_manager:
+                self.cache_manager.set('dynamic_rate', cache_key, rate, ttl=900)
+
+            return rate
 
         finally:
-            cursor.close()
-            conn.close()
+            # Only release if we checked out our own connection
+            if own_connection:
+                cursor.close()
+                self._put_conn(conn)
 
     # ========== Tier Management ==========
 
+    def _compute_employee_tier(self, cursor, employee_id: int, year: int, month: int):
+        """Determine the tier an employee earns for a month (read-only).
+
+        Args:
+            cursor: Open cursor to run queries on
+            employee_id: Employee ID
+            year: Year to calculate sales for
+            month: Month to calculate sales for
+
+        Returns:
+            Tuple (result dict as returned by update_employee_tier, new tier id)
+        """
+        # Get current tier and total sales for the month in one round-trip
+        cursor.execute("""
+            SELECT
+                (SELECT bc.name
+                 FROM employees e
+                 LEFT JOIN base_commissions bc ON e.base_commission_id = bc.id
+                 WHERE e.id = %s) as tier_name,
+                (SELECT COALESCE(SUM(total_sales), 0)
+                 FROM shifts
+                 WHERE employee_id = %s
+                   AND date >= %s
+                   AND date < %s) as total
+        """, (employee_id, employee_id, *month_bounds(year, month)))
+        current = cursor.fetchone()
+
+        return self._pick_tier(self._load_tiers(cursor), employee_id, current['tier_name'], float(current['total']))
+
+    def _load_tiers(self, cursor):
+        """Load tier definitions once for picking tiers in Python (read-only).
+
+        Amounts and percentages are converted to float here, so picking a
+        tier does no per-call conversion. Cached like the rates and ranks
+        lists when a cache_manager is set.
+
+        Args:
+            cursor: Open cursor to run queries on
+
+        Returns:
+            Tuple (active tiers sorted by min_amount, their min_amount floats,
+            the 'Tier C' fallback tier)
+        """
+        if self.cache_manager:
+            cached = self.cache_manager.get('base_commissions', 'all')
+            if cached is not None:
+                return cached
+
+        cursor.execute("""
+            SELECT id, name, percentage, min_amount, max_amount, is_active
+            FROM base_commissions
+            ORDER BY min_amount
+        """)
+        rows = [
+            {
+                'id': row['id'],
+                'name': row['name'],
+                'percentage': float(row['percentage']),
+                'min_amount': float(row['min_amount']),
+                'max_amount': float(row['max_amount']),
+                'is_active': row['is_active'],
+            }
+            for row in cursor.fetchall()
+        ]
+
+        active = [row for row in rows if row['is_active']]
+        mins = [row['min_amount'] for row in active]
+        default_tier = next((row for row in rows if row['name'] == 'Tier C'), None)
+        tiers = (active, mins, default_tier)
+
+        if self.cache_manager:
+            self.cache_manager.set('base_commissions', 'all', tiers, ttl=900)
+
+        return tiers
+
+    def _pick_tier(self, tiers, employee_id: int, old_tier_name: Optional[str], total_sales: float):
+        """Pick the tier matching monthly sales.
+
+        Args:
+            tiers: Result of _load_tiers()
+            employee_id: Employee ID
+            old_tier_name: Current tier name of the employee
+            total_sales: Employee's total sales for the month
+
+        Returns:
+            Tuple (result dict as returned by update_employee_tier, new tier id)
+        """
+        active, mins, default_tier = tiers
+
+        # Active tier with the highest min_amount <= total_sales, if total_sales is within its max
+        idx = bisect_right(mins, total_sales) - 1
+        if idx >= 0 and total_sales <= active[idx]['max_amount']:
+            new_tier = active[idx]
+        else:
+            # Default to Tier C
+            new_tier = default_tier
+
+        result = {
+            'employee_id': employee_id,
+            'old_tier': old_tier_name,
+            'new_tier': new_tier['name'],
+            'new_percentage': new_tier['percentage'],
+            'total_sales': total_sales,
+            'changed': old_tier_name != new_tier['name']
+        }
+        return result, new_tier['id']
+
     def update_employee_tier(self, employee_id: int, year: int, month: int) -> Optional[Dict]:
         """Update employee tier based on sales for specified month.
 
@@ -849,39 +1350,7 @@ class PostgresService:
         cursor = conn.cursor()
 
         try:
-            # Get current tier
-            cursor.execute("""
-                SELECT e.base_commission_id, bc.name as tier_name
-                FROM employees e
-                LEFT JOIN base_commissions bc ON e.base_commission_id = bc.id
-                WHERE e.id = %s
-            """, (employee_id,))
-            current = cursor.fetchone()
-            old_tier_name = current['tier_name'] if current else None
-
-            # Get total sales for the month
-            cursor.execute("""
-                SELECT COALESCE(SUM(total_sales), 0) as total
-                FROM shifts
-                WHERE employee_id = %s
-                  AND EXTRACT(YEAR FROM date) = %s
-                  AND EXTRACT(MONTH FROM date) = %s
-            """, (employee_id, year, month))
-            result = cursor.fetchone()
-            total_sales = float(result['total']) if result else 0
-
-            # Determine new tier
-            cursor.execute("""
-                SELECT id, name, percentage FROM base_commissions
-                WHERE %s >= min_amount AND %s <= max_amount AND is_active = TRUE
-                ORDER BY min_amount DESC LIMIT 1
-            """, (total_sales, total_sales))
-            new_tier = cursor.fetchone()
-
-            if not new_tier:
-                # Default to Tier C
-                cursor.execute("SELECT id, name, percentage FROM base_commissions WHERE name = 'Tier C'")
-                new_tier = cursor.fetchone()
+            result, tier_id = self._compute_employee_tier(cursor, employee_id, year, month)
 
             # Update employee
             cursor.execute("""
@@ -890,26 +1359,25 @@ class PostgresService:
                     last_tier_update = CURRENT_DATE,
                     updated_at = now()
                 WHERE id = %s
-            """, (new_tier['id'], employee_id))
+            """, (tier_id, employee_id))
 
             conn.commit()
 
-            return {
-                'employee_id': employee_id,
-                'old_tier': old_tier_name,
-                'new_tier': new_tier['name'],
-                'new_percentage': float(new_tier['percentage']),
-                'total_sales': total_sales,
-                'changed': old_tier_name != new_tier['name']
-            }
+            return result
 
+        except Exception:
+            conn.rollback()
+            raise
         finally:
             cursor.close()
-            conn.close()
+            self._put_conn(conn)
 
     def update_all_employee_tiers(self, year: int, month: int) -> List[Dict]:
         """Update tiers for all active employees based on sales for specified month.
 
+        All tiers are computed on one connection and written with a single
+        batched UPDATE in one transaction.
+
         Args:
             year: Year to calculate sales for
             month: Month to calculate sales for
@@ -921,22 +1389,57 @@ class PostgresService:
         cursor = conn.cursor()
 
         try:
-            # Get all active employees
-            cursor.execute("SELECT id, name FROM employees WHERE is_active = TRUE")
+            # Current tier and monthly sales of every active employee in one query
+            cursor.execute("""
+                SELECT e.id, e.name, bc.name as tier_name,
+                       COALESCE(SUM(s.total_sales), 0) as total
+                FROM employees e
+                LEFT JOIN base_commissions bc ON e.base_commission_id = bc.id
+                LEFT JOIN shifts s ON s.employee_id = e.id
+                    AND s.date >= %s
+                    AND s.date < %s
+                WHERE e.is_active = TRUE
+                GROUP BY e.id, e.name, bc.name
+            """, month_bounds(year, month))
             employees = cursor.fetchall()
 
+            # Tier definitions once for all employees
+            tiers = self._load_tiers(cursor)
+
             results = []
+            updates = []
             for emp in employees:
-                result = self.update_employee_tier(emp['id'], year, month)
-                if result:
-                    result['employee_name'] = emp['name']
-                    results.append(result)
+                result, tier_id = self._pick_tier(tiers, emp['id'], emp['tier_name'], float(emp['total']))
+                result['employee_name'] = emp['name']
+                results.append(result)
+                updates.append((emp['id'], tier_id))
+
+            if updates:
+                # COPY new tiers into a staging table, then one set-based UPDATE
+                cursor.execute("""
+                    CREATE TEMP TABLE tmp_tier_upd (id BIGINT, tier_id INT) ON COMMIT DROP
+                """)
+                buf = io.StringIO("".join(f"{emp_id}\t{tier_id}\n" for emp_id, tier_id in updates))
+                cursor.copy_expert("COPY tmp_tier_upd (id, tier_id) FROM STDIN", buf)
+                cursor.execute("""
+                    UPDATE employees AS e
+                    SET base_commission_id = t.tier_id,
+                        last_tier_update = CURRENT_DATE,
+                        updated_at = now()
+                    FROM tmp_tier_upd t
+                    WHERE e.id = t.id
+                """)
+
+            conn.commit()
 
             return results
 
+        except Exception:
+            conn.rollback()
+            raise
         finally:
             cursor.close()
-            conn.close()
+            self._put_conn(conn)
 
     # ========== Ranks ==========
 
@@ -1001,7 +1504,7 @@ class PostgresService:
 
         finally:
             cursor.close()
-            conn.close()
+            self._put_conn(conn)
 
     def get_employee_rank(self, employee_id: int, year: int, month: int) -> Optional[Dict]:
         """Get employee rank record for a specific month.
@@ -1060,7 +1563,7 @@ class PostgresService:
 
         finally:
             cursor.close()
-            conn.close()
+            self._put_conn(conn)
 
     def update_employee_rank(
         self,
@@ -1102,9 +1605,9 @@ class PostgresService:
                     SELECT COALESCE(SUM(total_sales), 0) as total
                     FROM shifts
                     WHERE employee_id = %s
-                      AND EXTRACT(YEAR FROM date) = %s
-                      AND EXTRACT(MONTH FROM date) = %s
-                """, (employee_id, year, month))
+                      AND date >= %s
+                      AND date < %s
+                """, (employee_id, *month_bounds(year, month)))
                 result = cursor.fetchone()
                 total_sales = float(result['total']) if result else 0.0
 
@@ -1150,7 +1653,7 @@ class PostgresService:
             raise
         finally:
             cursor.close()
-            conn.close()
+            self._put_conn(conn)
 
     def mark_rank_notified(self, employee_id: int, year: int, month: int) -> None:
         """Mark that employee was notified about rank change.
@@ -1184,7 +1687,7 @@ class PostgresService:
             raise
         finally:
             cursor.close()
-            conn.close()
+            self._put_conn(conn)
 
     def determine_rank(self, employee_id: int, year: int, month: int) -> str:
         """Determine employee rank based on monthly total sales.
@@ -1201,27 +1704,22 @@ class PostgresService:
         cursor = conn.cursor()
 
         try:
-            # Calculate total sales for the month
+            # Sum the month's sales and match the rank in one query; the NUMERIC
+            # total is compared server-side with no float round-trip
             month_val = f"{year}-{month:02d}"
             cursor.execute("""
-                SELECT COALESCE(SUM(total_sales), 0) as total
-                FROM shifts
-                WHERE employee_id = %s
-                  AND to_char(clock_in, 'YYYY-MM') = %s
-            """, (employee_id, month_val))
-
-            result = cursor.fetchone()
-            total_sales = float(result['total']) if result else 0.0
-
-            # Get ranks and find matching rank
-            cursor.execute("""
-                SELECT name
-                FROM ranks
-                WHERE min_amount <= %s AND max_amount > %s
-                  AND is_active = true
-                ORDER BY min_amount
+                SELECT r.name
+                FROM (
+                    SELECT COALESCE(SUM(total_sales), 0) as total
+                    FROM shifts
+                    WHERE employee_id = %s
+                      AND to_char(clock_in, 'YYYY-MM') = %s
+                ) m
+                JOIN ranks r ON r.min_amount <= m.total AND r.max_amount > m.total
+                WHERE r.is_active = true
+                ORDER BY r.min_amount
                 LIMIT 1
-            """, (total_sales, total_sales))
+            """, (employee_id, month_val))
 
             rank = cursor.fetchone()
             return rank['name'] if rank else "Rookie"
@@ -1231,7 +1729,7 @@ class PostgresService:
             return "Rookie"
         finally:
             cursor.close()
-            conn.close()
+            self._put_conn(conn)
 
     def get_rank_text(self, rank_name: str) -> str:
         """Get rank description text.
@@ -1302,7 +1800,7 @@ class PostgresService:
 
         finally:
             cursor.close()
-            conn.close()
+            self._put_conn(conn)
 
     def create_bonus(
         self,
@@ -1353,7 +1851,7 @@ class PostgresService:
             raise
         finally:
             cursor.close()
-            conn.close()
+            self._put_conn(conn)
 
     def apply_bonus(self, bonus_id: int, shift_id: int, cursor=None) -> None:
         """Apply a bonus to a shift.
@@ -1363,6 +1861,19 @@ class PostgresService:
             shift_id: Shift ID
             cursor: Optional cursor to use (for transaction reuse)
         """
+        self.apply_bonuses([bonus_id], shift_id, cursor=cursor)
+
+    def apply_bonuses(self, bonus_ids: List[int], shift_id: int, cursor=None) -> None:
+        """Apply several bonuses to a shift with one UPDATE.
+
+        Args:
+            bonus_ids: Bonus IDs
+            shift_id: Shift ID
+            cursor: Optional cursor to use (for transaction reuse)
+        """
+        if not bonus_ids:
+            return
+
         # Use provided cursor or create new connection
         own_connection = cursor is None
         if own_connection:
@@ -1375,14 +1886,14 @@ class PostgresService:
                 SET applied = TRUE,
                     shift_id = %s,
                     applied_at = now()
-                WHERE id = %s
-            """, (shift_id, bonus_id))
+                WHERE id = ANY(%s)
+            """, (shift_id, list(bonus_ids)))
 
             # Only commit if we created our own connection
             if own_connection:
                 conn.commit()
 
-            logger.info(f"✓ Applied bonus {bonus_id} to shift {shift_id}")
+            logger.info(f"✓ Applied bonuses {list(bonus_ids)} to shift {shift_id}")
 
             # Invalidate cache
             if self.cache_manager:
@@ -1394,10 +1905,10 @@ class PostgresService:
             logger.error(f"Failed to apply bonus: {e}")
             raise
         finally:
-            # Only close if we created our own connection
+            # Only release if we checked out our own connection
             if own_connection:
                 cursor.close()
-                conn.close()
+                self._put_conn(conn)
 
     def get_shift_applied_bonuses(self, shift_id: int) -> List[Dict]:
         """Get bonuses applied to a shift in SheetsService format.
@@ -1443,7 +1954,7 @@ class PostgresService:
 
         finally:
             cursor.close()
-            conn.close()
+            self._put_conn(conn)
 
     # ========== Helper Methods ==========
 
@@ -1528,7 +2039,7 @@ class PostgresService:
 
         finally:
             cursor.close()
-            conn.close()
+            self._put_conn(conn)
 
     def find_shifts_with_model(
         self,
@@ -1581,19 +2092,13 @@ class PostgresService:
 
             cursor.execute(query, (employee_id, cutoff_date, days_back, current_timestamp, product_id))
 
-            shift_ids = cursor.fetchall()
+            shift_ids = [row['id'] for row in cursor.fetchall()]
 
-            result = []
-            for row in shift_ids:
-                shift = self.get_shift_by_id(row['id'])
-                if shift:
-                    result.append(shift)
-
-            return result
+            return self._fetch_shifts(cursor, shift_ids)
 
         finally:
             cursor.close()
-            conn.close()
+            self._put_conn(conn)
 
 
 # For backward compatibility and testing
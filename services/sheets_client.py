@@ -0,0 +1,22 @@
+"""Shared authorized Google Sheets client.
+
+Authorizing a service account reads the key file, signs a JWT and fetches
+an access token. Everything in a process that talks to Sheets goes through
+one client (and its HTTP session) instead of authorizing again.
+"""
+
+from functools import lru_cache
+
+import gspread
+
+from config import Config
+
+
+@lru_cache(maxsize=1)
+def get_sheets_client() -> gspread.Client:
+    """Get authorized gspread client, created once per process.
+
+    Returns:
+        Authorized gspread client.
+    """
+    return gspread.service_account(filename=Config.GOOGLE_SA_JSON)
@@ -1,6 +1,8 @@
 """Handlers for Telegram bot shift tracking."""
 
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal, InvalidOperation
 from datetime import timedelta
 from typing import Dict
@@ -15,7 +17,7 @@ from config import EDIT_DATE_IN, EDIT_TIME_IN, EDIT_DATE_OUT, EDIT_TIME_OUT, EDI
 
 from src.time_utils import (
     now_et, format_dt, hour_from_label, create_datetime_from_date_and_hour,
-    parse_dt, get_server_date
+    parse_dt, get_server_date, month_bounds
 )
 from services.singleton import sheets_service  # Use singleton instance with caching
 from services.rank_service import RankService
@@ -1392,6 +1394,46 @@ async def handle_edit_total_sales_input(update: Update, context: ContextTypes.DE
 # =============================================================================
 
 
+def _sum_statistics(sheets, employee_id: int, year: int, month: int, pay_day_start) -> tuple:
+    """Sum an employee's sales this month and earnings since the last pay day.
+
+    One pass over the employee's shifts streamed from the database. Blocking,
+    so handlers run it with asyncio.to_thread().
+
+    Args:
+        sheets: Data service (PostgresService).
+        employee_id: Employee ID.
+        year: Current year.
+        month: Current month.
+        pay_day_start: Start of the current pay period (ET).
+
+    Returns:
+        Tuple (total sales this month, total made since pay day) as Decimals.
+    """
+    total_sales_month = Decimal("0")
+    total_made_since_payday = Decimal("0")
+    for record in sheets.iter_shifts(employee_id=employee_id):
+        record_date = record.get("Date", "")
+        if record_date:
+            try:
+                # Convert PostgreSQL format (YYYY-MM-DD) to expected format (YYYY/MM/DD)
+                date_str = str(record_date).replace("-", "/")
+                dt = parse_dt(date_str)
+                if dt.year == year and dt.month == month:
+                    sales = record.get("Total sales", 0)
+                    if sales:
+                        total_sales_month += Decimal(str(sales))
+                if dt >= pay_day_start:
+                    made = record.get("Total made", 0)
+                    if made:
+                        total_made_since_payday += Decimal(str(made))
+            except Exception as e:
+                logger.debug(f"Failed to parse date {record_date}: {e}")
+                pass
+
+    return total_sales_month, total_made_since_payday
+
+
 async def show_statistics(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Show user statistics (rank, sales, pay day).
 
@@ -1432,28 +1474,6 @@ async def show_statistics(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
         rank_emoji = rank_service._get_rank_emoji(current_rank)
 
-        # Calculate total sales for current month
-        from decimal import Decimal
-        all_records = sheets.get_all_shifts()
-
-        total_sales_month = Decimal("0")
-        for record in all_records:
-            if str(record.get("EmployeeId")) == str(user.id):
-                record_date = record.get("Date", "")
-                if record_date:
-                    try:
-                        # Convert PostgreSQL format (YYYY-MM-DD) to expected format (YYYY/MM/DD)
-                        date_str = str(record_date).replace("-", "/")
-                        dt = parse_dt(date_str)
-                        if dt.year == year and dt.month == month:
-                            sales = record.get("Total sales", 0)
-                            if sales:
-                                total_sales_month += Decimal(str(sales))
-                    except Exception as e:
-                        logger.debug(f"Failed to parse date {record_date}: {e}")
-                        pass
-
-        # Calculate total made since last pay day
         # Pay days are 1st and 15th of each month
         if now.day < 15:
             # Last pay day was 1st of current month
@@ -1468,22 +1488,11 @@ async def show_statistics(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             else:
                 next_pay_day = now.replace(month=month+1, day=1)
 
-        total_made_since_payday = Decimal("0")
-        for record in all_records:
-            if str(record.get("EmployeeId")) == str(user.id):
-                record_date = record.get("Date", "")
-                if record_date:
-                    try:
-                        # Convert PostgreSQL format (YYYY-MM-DD) to expected format (YYYY/MM/DD)
-                        date_str = str(record_date).replace("-", "/")
-                        dt = parse_dt(date_str)
-                        if dt >= pay_day_start:
-                            made = record.get("Total made", 0)
-                            if made:
-                                total_made_since_payday += Decimal(str(made))
-                    except Exception as e:
-                        logger.debug(f"Failed to parse date {record_date}: {e}")
-                        pass
+        # Total sales for current month and total made since last pay day,
+        # summed in a worker thread so the scan doesn't block the event loop
+        total_sales_month, total_made_since_payday = await asyncio.to_thread(
+            _sum_statistics, sheets, user.id, year, month, pay_day_start
+        )
 
         # Format message
         message = f"📊 Your Statistics\n\n"
@@ -1781,37 +1790,59 @@ async def recalc_ranks_command(update: Update, context: ContextTypes.DEFAULT_TYP
     try:
         # Get all unique employee IDs from shifts AND employee_ranks this month
         # This ensures we recalculate even for employees whose shifts were deleted
-        conn = sheets._get_conn()
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT DISTINCT employee_id FROM (
-                SELECT employee_id FROM shifts
-                WHERE EXTRACT(YEAR FROM date) = %s AND EXTRACT(MONTH FROM date) = %s
-                UNION
-                SELECT employee_id FROM employee_ranks
-                WHERE year = %s AND month = %s
-            ) combined
-        """, (year, month, year, month))
-
-        employee_ids = [row['employee_id'] for row in cursor.fetchall()]
-        cursor.close()
-        conn.close()
-
-        updated = 0
-        rank_changes = []  # Track rank changes for report
+        def fetch_employee_ids():
+            conn = sheets._get_conn()
+            cursor = conn.cursor()
+            try:
+                cursor.execute("""
+                    SELECT DISTINCT employee_id FROM (
+                        SELECT employee_id FROM shifts
+                        WHERE date >= %s AND date < %s
+                        UNION
+                        SELECT employee_id FROM employee_ranks
+                        WHERE year = %s AND month = %s
+                    ) combined
+                """, (*month_bounds(year, month), year, month))
+                return [row['employee_id'] for row in cursor.fetchall()]
+            finally:
+                cursor.close()
+                sheets._put_conn(conn)
+
+        # Blocking database work runs in threads so the event loop keeps
+        # serving other users meanwhile
+        employee_ids = await asyncio.to_thread(fetch_employee_ids)
 
-        for emp_id in employee_ids:
-            rank_service = RankService(sheets)
+        rank_service = RankService(sheets)
+
+        def recalc_employee(emp_id):
             rank_change = rank_service.check_and_update_rank(emp_id, year, month)
-            updated += 1
 
             # If rank changed and there's a bonus
+            if rank_change and rank_change.get("changed") and rank_change.get("bonus"):
+                # Apply bonus (will be used on next shift)
+                rank_service.apply_rank_bonus(emp_id, rank_change["bonus"])
+
+            return emp_id, rank_change
+
+        # Employees are independent: recalculate them concurrently, each worker
+        # checking its own connections out of the pool. A worker may hold two
+        # connections at once (some methods borrow a second one), so workers
+        # use at most half the pool and the rest stays free for other
+        # handlers, jobs and scans. Checkouts beyond the pool wait, not fail.
+        max_workers = max(1, Config.DB_POOL_MAX // 4)
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = await asyncio.gather(*(
+                loop.run_in_executor(executor, recalc_employee, emp_id)
+                for emp_id in employee_ids
+            ))
+
+        updated = len(results)
+        rank_changes = []  # Track rank changes for report
+
+        for emp_id, rank_change in results:
             if rank_change and rank_change.get("changed"):
                 bonus = rank_change.get("bonus")
-                if bonus:
-                    # Apply bonus (will be used on next shift)
-                    rank_service.apply_rank_bonus(emp_id, bonus)
 
                 # Track for report
                 rank_changes.append({
@@ -1,6 +1,8 @@
 """Time utilities for handling America/New_York timezone."""
 
-from datetime import datetime, timedelta
+import sys
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 from typing import List, Tuple
 import pytz
 
@@ -33,19 +35,39 @@ def format_dt(dt: datetime) -> str:
     Returns:
         Formatted string.
     """
-    return dt.strftime(Config.DATE_FORMAT)
+    # Same output as dt.strftime(Config.DATE_FORMAT) without parsing the format
+    return (
+        f"{dt.year:04d}/{dt.month:02d}/{dt.day:02d} "
+        f"{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}"
+    )
 
 
+@lru_cache(maxsize=4096)
 def parse_dt(dt_str: str) -> datetime:
     """Parse datetime string from YYYY/MM/DD HH:MM:SS format.
 
+    Results are memoized: the same shift dates are parsed over and over
+    when listing or aggregating shifts, and datetimes are immutable.
+
     Args:
         dt_str: Datetime string to parse.
 
     Returns:
         Datetime object in ET timezone.
     """
-    dt = datetime.strptime(dt_str, Config.DATE_FORMAT)
+    if (
+        len(dt_str) == 19
+        and dt_str[4] == dt_str[7] == "/"
+        and dt_str[10] == " "
+        and dt_str[13] == dt_str[16] == ":"
+    ):
+        # Fixed-width YYYY/MM/DD HH:MM:SS: slice the fields, no strptime
+        dt = datetime(
+            int(dt_str[0:4]), int(dt_str[5:7]), int(dt_str[8:10]),
+            int(dt_str[11:13]), int(dt_str[14:16]), int(dt_str[17:19])
+        )
+    else:
+        dt = datetime.strptime(dt_str, Config.DATE_FORMAT)
     return ET_TZ.localize(dt) if dt.tzinfo is None else dt
 
 
@@ -110,4 +132,21 @@ def get_server_date(offset_days: int = 0) -> Tuple[datetime, str]:
         Tuple of (date object, formatted string).
     """
     dt = now_et() + timedelta(days=offset_days)
-    return dt.date(), dt.strftime("%Y/%m/%d")
+    # Date-only strings repeat constantly; datetimes are not interned
+    return dt.date(), sys.intern(f"{dt.year:04d}/{dt.month:02d}/{dt.day:02d}")
+
+
+def month_bounds(year: int, month: int) -> Tuple[date, date]:
+    """Get the date range of a calendar month.
+
+    Args:
+        year: Year.
+        month: Month (1-12).
+
+    Returns:
+        Tuple of (first day of the month, first day of the next month),
+        for half-open ``date >= start AND date < end`` filters.
+    """
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start, end
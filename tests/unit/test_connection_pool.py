@@ -0,0 +1,135 @@
+"""Unit tests for CachingConnectionPool.
+
+psycopg2.connect is replaced by a stub, so no database is needed.
+
+Tests:
+1. getconn() times out with PoolError when all maxconn are checked out
+2. Idle connections above minconn are closed after idle_timeout
+3. putconn(close=True) frees the slot for the next getconn()
+4. closeall() closes every connection and stops the closer thread
+"""
+
+import time
+
+import pytest
+from psycopg2 import extensions, pool
+
+from services import postgres_service
+from services.postgres_service import CachingConnectionPool
+
+
+class StubInfo:
+    transaction_status = extensions.TRANSACTION_STATUS_IDLE
+
+
+class StubCursor:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        pass
+
+
+class StubConnection:
+    """Just enough of a psycopg2 connection for the pool."""
+
+    def __init__(self):
+        self.closed = 0
+        self.info = StubInfo()
+
+    def cursor(self):
+        return StubCursor()
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = 1
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    """Patch psycopg2.connect; returns the list of stub connections made."""
+    made = []
+
+    def connect(*args, **kwargs):
+        conn = StubConnection()
+        made.append(conn)
+        return conn
+
+    monkeypatch.setattr(postgres_service.psycopg2, "connect", connect)
+    yield made
+    postgres_service._stop_closer()
+
+
+def test_getconn_times_out_when_exhausted(connections):
+    """getconn() raises PoolError after timeout once maxconn are checked out."""
+    conn_pool = CachingConnectionPool(0, 2, timeout=0.1)
+    conn_pool.getconn()
+    conn_pool.getconn()
+
+    started = time.monotonic()
+    with pytest.raises(pool.PoolError, match="exhausted"):
+        conn_pool.getconn()
+    assert time.monotonic() - started >= 0.1
+    assert len(connections) == 2
+
+
+def test_idle_connections_evicted_after_idle_timeout(connections):
+    """Connections idle longer than idle_timeout are closed, minconn are kept."""
+    conn_pool = CachingConnectionPool(1, 3, idle_timeout=0.05)
+    first, second, third = conn_pool.getconn(), conn_pool.getconn(), conn_pool.getconn()
+    for conn in (first, second, third):
+        conn_pool.putconn(conn)
+    assert len(conn_pool._idle) == 3
+
+    time.sleep(0.1)
+    reused = conn_pool.getconn()
+    postgres_service._stop_closer()
+
+    # The most recently returned connection is reused, the two older ones
+    # are evicted down to minconn
+    assert reused is third
+    assert conn_pool._idle == []
+    assert first.closed and second.closed
+    assert not third.closed
+
+
+def test_putconn_close_frees_slot(connections):
+    """putconn(close=True) discards the connection and frees its slot."""
+    conn_pool = CachingConnectionPool(0, 1, timeout=0.1)
+    conn = conn_pool.getconn()
+    conn_pool.putconn(conn, close=True)
+
+    replacement = conn_pool.getconn()
+    postgres_service._stop_closer()
+
+    assert replacement is not conn
+    assert conn.closed
+    assert len(connections) == 2
+
+
+def test_closeall_stops_closer_thread(connections):
+    """closeall() closes idle and used connections and stops the closer thread."""
+    conn_pool = CachingConnectionPool(1, 3)
+    discarded = conn_pool.getconn()
+    used = conn_pool.getconn()
+    conn_pool.putconn(discarded, close=True)
+    closer = postgres_service._closer_thread
+    assert closer is not None and closer.is_alive()
+
+    conn_pool.closeall()
+
+    assert conn_pool.closed
+    assert all(conn.closed for conn in connections)
+    assert used.closed
+    assert not closer.is_alive()
+    assert postgres_service._closer_thread is None
+    with pytest.raises(pool.PoolError, match="closed"):
+        conn_pool.getconn()